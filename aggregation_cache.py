@@ -0,0 +1,129 @@
+# 데이터셋별 집계 결과(기술통계, 상관계수, 그룹 평균, 등급표 등) 메모이제이션
+import functools
+import inspect
+import itertools
+import weakref
+from collections import OrderedDict
+
+from config import AGGREGATION_CACHE_SIZE
+
+_versions = {}
+_version_counter = itertools.count(1)
+
+
+def dataset_version(df):
+    """
+    DataFrame마다 고유한 데이터셋 버전 번호를 반환합니다.
+    같은 DataFrame 객체에는 항상 같은 번호가, 새로 불러온 DataFrame에는 새 번호가 부여됩니다.
+    """
+    key = id(df)
+    version = _versions.get(key)
+    if version is None:
+        version = next(_version_counter)
+        _versions[key] = version
+        weakref.finalize(df, _forget_dataset, key)
+    return version
+
+
+def _forget_dataset(key):
+    # DataFrame이 사라지면 버전 번호와 그 버전의 집계 결과를 함께 제거
+    version = _versions.pop(key, None)
+    if version is not None:
+        _cache.discard_version(version)
+
+
+def bump_dataset_version(df):
+    """DataFrame의 점수를 직접 수정한 경우 호출해, 이전 집계 결과를 더 이상 사용하지 않게 합니다."""
+    if id(df) not in _versions:
+        dataset_version(df)
+    else:
+        _cache.discard_version(_versions[id(df)])
+        _versions[id(df)] = next(_version_counter)
+
+
+class LRUCache:
+    """최대 maxsize개 항목을 보관하고, 가장 오래 사용하지 않은 항목부터 제거하는 캐시."""
+
+    def __init__(self, maxsize=AGGREGATION_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        if key in self._data:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+        self.misses += 1
+        return default
+
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def discard_version(self, version):
+        """데이터셋 버전 version의 항목을 모두 제거합니다. (키의 첫 원소가 데이터셋 버전)"""
+        for key in [key for key in self._data if key[0] == version]:
+            del self._data[key]
+
+    def clear(self):
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+
+_cache = LRUCache()
+_MISSING = object()
+
+
+def _freeze(value):
+    # 리스트/딕셔너리 인자도 캐시 키로 쓸 수 있도록 변환
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    return value
+
+
+def memoized(operation):
+    """
+    첫 번째 인자로 DataFrame을 받는 함수의 결과를 (데이터셋 버전, 연산 이름, 나머지 인자)
+    기준으로 캐시하는 데코레이터.
+
+    캐시된 결과는 여러 호출에서 공유되므로 반환값을 직접 수정하면 안 됩니다.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(df, *args, **kwargs):
+            # 위치/키워드 인자, 기본값 사용 여부와 관계없이 같은 호출은 같은 키가 되도록 정규화
+            bound = signature.bind(df, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = list(bound.arguments.items())[1:]
+            key = (dataset_version(df), operation, _freeze(arguments))
+            result = _cache.get(key, _MISSING)
+            if result is _MISSING:
+                result = func(df, *args, **kwargs)
+                _cache.put(key, result)
+            return result
+        return wrapper
+    return decorator
+
+
+def cache_info():
+    """캐시 적중/미스 횟수와 현재 크기를 반환합니다."""
+    return {'hits': _cache.hits, 'misses': _cache.misses, 'size': len(_cache), 'maxsize': _cache.maxsize}
+
+
+def clear_cache():
+    """모든 집계 캐시를 비웁니다."""
+    _cache.clear()
@@ -1,18 +1,24 @@
 
 # GradeScope-EDA: 메뉴 기반 학생 성적 분석 시스템
-import pandas as pd
+import argparse
+import json
+import os
 
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from data_loader import load_data
-from grade_calculator import assign_grades
-from rank_and_grade import calculate_rank_and_grade
+from data_loader import detect_subjects, load_data
+from rank_and_grade import get_ranks_and_grades
+from grade_calculator import get_policy
+from parallel_grading import grade_in_parallel, grading_groups
 from student_id_lookup import lookup_student_info
-from config import GRADE_SYSTEM, AVAILABLE_GRADE_YEARS, DEFAULT_SUBJECTS
-
-plt.rcParams['font.family'] = ['Malgun Gothic', 'NanumGothic', 'DejaVu Sans']
-plt.rcParams['axes.unicode_minus'] = False
+from grade_index import get_grade_index
+from top_k import top_k, bottom_k
+from streaming_stats import stats_from_frame
+from figure_pipeline import box_stats, density_grid, render_figures
+from aggregation_cache import memoized
+import profiling
+from profiling import profiled, stage
+from config import (GRADE_SYSTEM, AVAILABLE_GRADE_YEARS, FIGURE_WORKERS,
+                    FIGURE_SCATTER_MAX_POINTS)
 
 def show_main_menu():
     print("\n" + "="*70)
@@ -23,47 +29,205 @@ def show_main_menu():
     print("3. 학생 ID 조회")
     print("="*70)
 
-def run_basic_analysis(df):
+def compute_descriptive_stats(df, subjects=None):
+    """1. 기술통계: 과목별 요약 통계와 학년별 과목 평균."""
+    subjects = detect_subjects(df) if subjects is None else list(subjects)
+    stats = stats_from_frame(df, subjects, attendance=False)
+    stat_df = stats.describe(subjects).loc[['평균', '표준편차', '최솟값', '최댓값', '중앙값']]
+    return {'기술통계': stat_df, '학년별_과목평균': df.groupby('학년')[subjects].mean()}
+
+def compute_relationships(df, subjects=None):
+    """2. 관계 분석: 출석률(%)과 과목 간 상관계수 (누적기의 공적률에서 바로 계산)."""
+    subjects = detect_subjects(df) if subjects is None else list(subjects)
+    if '출석률(%)' not in df.columns:
+        return {}
+    attendance_corr = stats_from_frame(df, subjects).correlation(['출석률(%)'] + subjects)['출석률(%)']
+    return {'출석률_상관계수': attendance_corr,
+            '과목_상관행렬': stats_from_frame(df, subjects, attendance=False).correlation(subjects)}
+
+def compute_top_bottom(df, subjects=None):
+    """3. 상위/하위 학생 탐색: 총점 기준 상위/하위 10명과 반별 상위 10명."""
+    subjects = detect_subjects(df) if subjects is None else list(subjects)
+    totals = df[subjects].sum(axis=1)
+    ranked = df[['학생ID', '학년', '반']].assign(총점=totals.round(1), 평균=(totals / len(subjects)).round(1))
+    return {
+        '상위10명': top_k(ranked, '총점', 10, keep='first'),
+        '하위10명': bottom_k(ranked, '총점', 10, keep='first'),
+        '반별_상위10명': top_k(ranked, '총점', 10, by=['학년', '반']),
+    }
+
+def compute_group_comparison(df, subjects=None):
+    """4. 집단 비교: 성별별 과목 평균."""
+    if '성별' not in df.columns:
+        return {}
+    subjects = detect_subjects(df) if subjects is None else list(subjects)
+    return {'성별별_과목평균': df.groupby('성별')[subjects].mean().round(1)}
+
+def compute_regression(df, subjects=None):
+    """5. 간단한 회귀(선형): 출석률(%) → 총점 단순 선형회귀 계수, 절편, R² (최소제곱 닫힌 해)."""
+    if '출석률(%)' not in df.columns:
+        return {}
+    subjects = detect_subjects(df) if subjects is None else list(subjects)
+    return {'회귀': stats_from_frame(df, subjects).regression('출석률(%)', '총점')}
+
+# 필수 과제 분석 단계별 계산 함수 (번호 순서대로 실행)
+BASIC_ANALYSIS_STAGES = [
+    ('1_기술통계', compute_descriptive_stats),
+    ('2_관계분석', compute_relationships),
+    ('3_상위하위', compute_top_bottom),
+    ('4_집단비교', compute_group_comparison),
+    ('5_회귀', compute_regression),
+]
+
+@memoized('basic_tables')
+def compute_basic_tables(df, subjects=None):
+    """
+    필수 과제 분석(기술통계, 관계 분석, 상위/하위 학생, 집단 비교, 회귀)에 필요한
+    집계표를 한 번에 계산합니다. 대화형 메뉴와 배치 모드가 같은 결과를 재사용합니다.
+
+    Args:
+        df (pd.DataFrame): 학생 성적 데이터가 담긴 DataFrame.
+        subjects (list, optional): 분석할 과목 목록. 지정하지 않으면 detect_subjects 결과.
+
+    Returns:
+        dict: 표 이름 → 계산 결과(DataFrame/Series).
+              데이터에 없는 컬럼(출석률(%), 성별)에 대한 표는 포함되지 않습니다.
+              결과는 데이터셋별로 캐시되므로 직접 수정하지 않습니다.
+    """
+    subjects = detect_subjects(df) if subjects is None else list(subjects)
+    tables = {}
+    for name, compute in BASIC_ANALYSIS_STAGES:
+        with stage(f'basic_analysis.{name}', rows=len(df)):
+            tables.update(compute(df, subjects))
+    return tables
+
+def plot(name, *args):
+    """
+    figures 모듈의 그리기 함수 name을 호출합니다.
+    matplotlib/seaborn은 불러오는 데 시간이 오래 걸리므로 그래프를 처음 그릴 때 불러옵니다.
+    """
+    import figures
+    return getattr(figures, name)(*args)
+
+def basic_figures(df, tables, subjects=None):
+    """
+    필수 과제 분석 그래프를 (파일 이름, figures 모듈의 그리기 함수 이름, 인자 튜플) 목록으로 반환합니다.
+    인자에는 그래프에 필요한 집계값만 담으므로, 작업 프로세스로 보내거나 그래프 캐시 키를 만드는 데
+    그대로 사용할 수 있습니다. 점이 FIGURE_SCATTER_MAX_POINTS보다 많으면 회귀 그래프는
+    산점도 대신 밀도 격자로 그립니다.
+    """
+    figures = [('학년별_과목평균', 'plot_year_means', (tables['학년별_과목평균'],))]
+    if '과목_상관행렬' in tables:
+        figures.append(('과목_상관행렬', 'plot_corr_heatmap', (tables['과목_상관행렬'],)))
+    if '성별별_과목평균' in tables:
+        figures.append(('성별별_과목평균', 'plot_gender_means', (tables['성별별_과목평균'],)))
+        if '출석률(%)' in df.columns:
+            figures.append(('학년별_출석률분포', 'plot_attendance_boxplot', (box_stats(df, '학년', '출석률(%)'),)))
+    if '회귀' in tables:
+        subjects = detect_subjects(df) if subjects is None else list(subjects)
+        totals = df[subjects].sum(axis=1)
+        line = (tables['회귀']['계수'], tables['회귀']['절편'])
+        if len(df) > FIGURE_SCATTER_MAX_POINTS:
+            figures.append(('출석률_총점_회귀', 'plot_regression_density',
+                            (*density_grid(df['출석률(%)'], totals), *line)))
+        else:
+            figures.append(('출석률_총점_회귀', 'plot_regression', (df['출석률(%)'], totals, *line)))
+    return figures
+
+def compute_top_students(rank_table, df, year, subject, k=10):
+    """
+    get_ranks_and_grades 결과에서 특정 학년/과목 상위 k명 표를 만듭니다.
+    석차표에 '학교' 컬럼이 있으면(학교 × 학년 단위 석차) 학교마다 상위 k명을 선택합니다.
+
+    Returns:
+        pd.DataFrame: '학생ID', ('학교'), '학년', '반', 과목 점수, '과목석차', '전체석차',
+                      '과목등급', '전체등급' 컬럼을 가진 표. 해당 학년 데이터가 없으면 빈 DataFrame.
+    """
+    year_table = rank_table[rank_table['학년'] == year]
+    if year_table.empty:
+        return pd.DataFrame()
+    schools = {'학교': year_table['학교']} if '학교' in year_table.columns else {}
+    merged = pd.DataFrame({
+        '학생ID': year_table['학생ID'],
+        **schools,
+        '학년': year_table['학년'],
+        '반': year_table['반'],
+        subject: df.loc[year_table.index, subject],
+        '과목석차': year_table[f'{subject}석차'],
+        '전체석차': year_table['전체석차'],
+        '과목등급': year_table[f'{subject}등급'],
+        '전체등급': year_table['전체등급'],
+    })
+    return top_k(merged, subject, k, by=list(schools) or None, keep='first')
+
+def compute_rank_tables(df, years, subjects, workers=1, top_subjects=None):
+    """
+    추가 기능 분석 표(전체 석차/등급표와 학년 × 과목별 상위 10명 표)를 계산합니다.
+
+    석차/등급은 grading_groups 기준(학교 컬럼이 있으면 학교 × 학년, 없으면 학년)으로 매기므로
+    workers와 관계없이 같은 결과를 반환합니다.
+
+    Args:
+        df (pd.DataFrame): 학생 성적 데이터가 담긴 DataFrame.
+        years (list): 상위 10명 표를 만들 학년 목록.
+        subjects (list): 석차/등급을 계산할 과목 목록 (총점은 이 과목들의 합).
+        workers (int, optional): 석차/등급 계산 프로세스 수 (1이면 병렬 처리 없이 캐시된 결과를 사용).
+        top_subjects (list, optional): 상위 10명 표를 만들 과목 목록. 지정하지 않으면 subjects.
+
+    Returns:
+        dict: 표 이름('석차_등급', '상위10명_{학년}학년_{과목}') → DataFrame.
+    """
+    if workers == 1:
+        rank_table = get_ranks_and_grades(df, subjects=subjects, group_by=grading_groups(df))
+    else:
+        rank_table = grade_in_parallel(df, workers=workers, subjects=subjects)
+    tables = {'석차_등급': rank_table}
+    for year in years:
+        for subject in (subjects if top_subjects is None else top_subjects):
+            tables[f'상위10명_{year}학년_{subject}'] = compute_top_students(rank_table, df, year, subject)
+    return tables
+
+@memoized('select_years')
+@profiled('select_years', declared_copies=1)
+def select_years(df, years):
+    """선택한 학년 데이터만 반환합니다. 같은 데이터셋/학년 조합이면 같은 DataFrame을 재사용합니다."""
+    return df[df['학년'].isin(years)]
+
+def ask_plot(prompt):
+    return input(prompt).strip().lower() == 'y'
+
+def run_basic_analysis(df, subjects=None):
+    subjects = detect_subjects(df) if subjects is None else list(subjects)
+    tables = compute_basic_tables(df, subjects)
+    figures = {name: (plot_name, args) for name, plot_name, args in basic_figures(df, tables, subjects)}
+
+    def show(name):
+        plot_name, args = figures[name]
+        plot('show_figure', plot(plot_name, *args))
+
     print("\n1. 기술통계\n" + "-"*60)
     # 1. 기술통계
     print("\n📊 기술통계(과목별/학년별):")
-    stat_df = df[['수학', '영어', '과학']].agg(['mean', 'std', 'min', 'max', lambda x:x.quantile(0.5)])
-    stat_df.index = ['평균', '표준편차', '최솟값', '최댓값', '중앙값']
-    print(stat_df.round(1))
+    print(tables['기술통계'].round(1))
     print("\n학년별 성적 비교:")
-    print(df.groupby('학년')[['수학', '영어', '과학']].mean().round(1))
-    show_plot = input("\n학년별 과목 평균 시각화를 보시겠습니까? (y/n): ").strip().lower()
-    if show_plot == 'y':
-        df.groupby('학년')[['수학', '영어', '과학']].mean().plot(kind='bar', figsize=(10, 6))
-        plt.title('학년별 과목 평균')
-        plt.xlabel('학년')
-        plt.ylabel('평균 점수')
-        plt.xticks(rotation=0)
-        plt.legend()
-        plt.tight_layout()
-        plt.show()
+    print(tables['학년별_과목평균'].round(1))
+    if ask_plot("\n학년별 과목 평균 시각화를 보시겠습니까? (y/n): "):
+        show('학년별_과목평균')
 
     print("\n2. 관계 분석\n" + "-"*60)
     # 2. 관계 분석
     if '출석률(%)' in df.columns:
         print("출석률(%)과 각 과목 점수 간 피어슨 상관계수:")
-        corr = df[['출석률(%)', '수학', '영어', '과학']].corr()['출석률(%)'].round(3)
-        print(corr)
-        show_plot = input("과목 간 상관 행렬(heatmap) 시각화를 보시겠습니까? (y/n): ").strip().lower()
-        if show_plot == 'y':
-            plt.figure(figsize=(8, 6))
-            sns.heatmap(df[['수학', '영어', '과학']].corr(), annot=True, cmap='coolwarm', center=0)
-            plt.title('과목 간 상관 행렬')
-            plt.show()
+        print(tables['출석률_상관계수'].round(3))
+        if ask_plot("과목 간 상관 행렬(heatmap) 시각화를 보시겠습니까? (y/n): "):
+            show('과목_상관행렬')
     else:
         print("출석률(%) 데이터가 없습니다.")
 
     print("\n3. 상위/하위 학생 탐색\n" + "-"*60)
     # 3. 상위/하위 학생 탐색
-    df['총점'] = (df['수학'] + df['영어'] + df['과학']).round(1)
-    df['평균'] = (df['총점'] / 3).round(1)
-    top_10 = df.sort_values(by='총점', ascending=False).head(10)[['학생ID', '학년', '반', '총점', '평균']]
-    bottom_10 = df.sort_values(by='총점', ascending=True).head(10)[['학생ID', '학년', '반', '총점', '평균']]
+    top_10 = tables['상위10명']
+    bottom_10 = tables['하위10명']
     print("상위 10명:")
     print(top_10)
     print(f"상위 10명 평균 총점: {top_10['총점'].mean():.1f}, 평균: {top_10['평균'].mean():.1f}")
@@ -75,51 +239,22 @@ def run_basic_analysis(df):
     # 4. 집단 비교
     if '성별' in df.columns:
         print("성별별 과목 평균 비교 표:")
-        gender_avg = df.groupby('성별')[['수학', '영어', '과학']].mean().round(1)
-        print(gender_avg)
-        show_plot = input("성별별 과목 평균 막대그래프를 보시겠습니까? (y/n): ").strip().lower()
-        if show_plot == 'y':
-            gender_avg.plot(kind='bar', figsize=(10, 6))
-            plt.title('성별별 과목 평균')
-            plt.xlabel('성별')
-            plt.ylabel('평균 점수')
-            plt.xticks(rotation=0)
-            plt.legend()
-            plt.tight_layout()
-            plt.show()
+        print(tables['성별별_과목평균'])
+        if ask_plot("성별별 과목 평균 막대그래프를 보시겠습니까? (y/n): "):
+            show('성별별_과목평균')
         if '출석률(%)' in df.columns:
-            show_plot = input("학년별 출석률 분포(박스플롯)를 보시겠습니까? (y/n): ").strip().lower()
-            if show_plot == 'y':
-                plt.figure(figsize=(8, 6))
-                sns.boxplot(x='학년', y='출석률(%)', data=df)
-                plt.xlabel('학년')
-                plt.ylabel('출석률 (%)')
-                plt.title('학년별 출석률 분포')
-                plt.show()
+            if ask_plot("학년별 출석률 분포(박스플롯)를 보시겠습니까? (y/n): "):
+                show('학년별_출석률분포')
     else:
         print("성별 데이터가 없습니다.")
 
     print("\n5. 간단한 회귀(선형)\n" + "-"*60)
     # 5. 간단한 회귀(선형)
     if '출석률(%)' in df.columns:
-        from sklearn.linear_model import LinearRegression
-        X = df[['출석률(%)']]
-        y = df['총점']
-        model = LinearRegression()
-        model.fit(X, y)
-        r_sq = model.score(X, y)
-        print(f"출석률(%) → 총점 단순 선형회귀 계수: {model.coef_[0]:.2f}")
-        print(f"R²: {r_sq:.2f}")
-        show_plot = input("출석률 vs 총점 산점도(회귀선 포함)를 보시겠습니까? (y/n): ").strip().lower()
-        if show_plot == 'y':
-            plt.figure(figsize=(8, 6))
-            plt.scatter(df['출석률(%)'], df['총점'], alpha=0.6)
-            plt.plot(X, model.predict(X), color='red', linewidth=2)
-            plt.xlabel('출석률 (%)')
-            plt.ylabel('총점')
-            plt.title('출석률 vs 총점 (회귀선 포함)')
-            plt.grid(True, alpha=0.3)
-            plt.show()
+        print(f"출석률(%) → 총점 단순 선형회귀 계수: {tables['회귀']['계수']:.2f}")
+        print(f"R²: {tables['회귀']['R²']:.2f}")
+        if ask_plot("출석률 vs 총점 산점도(회귀선 포함)를 보시겠습니까? (y/n): "):
+            show('출석률_총점_회귀')
     else:
         print("출석률(%) 데이터가 없습니다.")
 
@@ -131,13 +266,15 @@ def run_basic_analysis(df):
     print("4. 3학년이 1, 2학년보다 과학 과목에서 평균적으로 높은 성적을 보이고 있습니다.")
     print("\n✅ 필수 과제 분석이 완료되었습니다!\n")
 
-def run_additional_analysis(df):
+def run_additional_analysis(df, subjects=None):
+    subjects = detect_subjects(df) if subjects is None else list(subjects)
 
     print("\n" + "="*70)
     print("🛠️  2. 추가 기능 분석")
     print("="*70)
     print("\n📚 등급 산출 방식 안내\n" + "-"*50)
-    print("본 분석은 5등급 상대평가(상위 10%, 24%, 32%, 24%, 10%) 비율제 등급 산출 방식을 사용합니다.")
+    policy = get_policy(GRADE_SYSTEM)
+    print(f"본 분석은 {policy.description} 등급 산출 방식을 사용합니다.")
     print("-"*50)
     print("🏆 학년별 과목 상위 10명 조회")
     print("-"*50)
@@ -157,49 +294,108 @@ def run_additional_analysis(df):
         year = AVAILABLE_GRADE_YEARS[0]
 
     print(f"\n{year}학년의 조회할 과목을 선택하세요:")
-    for i, subject in enumerate(DEFAULT_SUBJECTS, 1):
+    for i, subject in enumerate(subjects, 1):
         print(f"{i}. {subject}")
     subject_choice = input("과목 번호를 입력하세요: ").strip()
     try:
         subject_idx = int(subject_choice) - 1
-        if 0 <= subject_idx < len(DEFAULT_SUBJECTS):
-            subject = DEFAULT_SUBJECTS[subject_idx]
+        if 0 <= subject_idx < len(subjects):
+            subject = subjects[subject_idx]
         else:
-            print("잘못된 입력입니다. 수학으로 기본 설정합니다.")
-            subject = DEFAULT_SUBJECTS[0]
+            subject = subjects[0]
+            print(f"잘못된 입력입니다. {subject}(으)로 기본 설정합니다.")
     except ValueError:
-        print("잘못된 입력입니다. 수학으로 기본 설정합니다.")
-        subject = DEFAULT_SUBJECTS[0]
+        subject = subjects[0]
+        print(f"잘못된 입력입니다. {subject}(으)로 기본 설정합니다.")
 
     # 상위 10명 출력
-    result = calculate_rank_and_grade(df, year, subject)
-    if not result.empty:
-        df_with_grades = assign_grades(df[df['학년'] == year].copy())
-        df_with_grades['전체석차'] = df_with_grades['총점'].rank(ascending=False, method='min').astype(int)
-        merged = df[df['학년'] == year][['학생ID', '학년', '반', subject]].merge(result, on='학생ID')
-        merged = merged.merge(df_with_grades[['학생ID', '전체석차', '등급']], on='학생ID', how='left')
-        merged = merged.rename(columns={'석차': '과목석차', '등급_x': '과목등급', '등급_y': '전체등급'})
-        print(f"\n📋 {year}학년 {subject} 상위 10명")
+    # 전체 학년 석차/등급표는 데이터셋당 한 번만 계산해 재사용
+    # (학교 컬럼이 있으면 배치 모드와 같이 학교 × 학년 단위로 석차/등급을 매김)
+    rank_table = get_ranks_and_grades(df, subjects=subjects, group_by=grading_groups(df))
+    top_10 = compute_top_students(rank_table, df, year, subject)
+    if not top_10.empty:
+        by_school = '학교' in top_10.columns
+        scope = f"학교별 {year}학년" if by_school else f"{year}학년"
+        print(f"\n📋 {scope} {subject} 상위 10명")
         print()
-        print("학생ID | 학년 | 반 | {0:4s} | 과목석차 | 전체석차 | 과목등급 | 전체등급".format(subject))
-        for _, row in merged.sort_values(by='과목석차').head(10).iterrows():
-            print(f"{row['학생ID']:6s} | {row['학년']:2d} | {row['반']:2s} | {row[subject]:3d} | {row['과목석차']:8d} | {row['전체석차']:8d} | {row['과목등급']:8d} | {row['전체등급']:8d}")
-        print("\n※ 과목석차: {0}학년 {1} 내 석차".format(year, subject))
-        print("※ 전체석차: {0}학년 전체 성적 내 석차".format(year))
-        print("※ 과목등급: {0}학년 {1} 기준 5등급".format(year, subject))
-        print("※ 전체등급: {0}학년 전체 성적 기준 5등급".format(year))
+        print(("학교 | " if by_school else "") + "학생ID | 학년 | 반 | {0:4s} | 과목석차 | 전체석차 | 과목등급 | 전체등급".format(subject))
+        for _, row in top_10.iterrows():
+            school = f"{row['학교']} | " if by_school else ""
+            print(f"{school}{row['학생ID']:6s} | {row['학년']:2d} | {row['반']:2s} | {row[subject]:3d} | {row['과목석차']:8d} | {row['전체석차']:8d} | {row['과목등급']:8d} | {row['전체등급']:8d}")
+        print("\n※ 과목석차: {0} {1} 내 석차".format(scope, subject))
+        print("※ 전체석차: {0} 전체 성적 내 석차".format(scope))
+        print("※ 과목등급: {0} {1} 기준 {2}등급".format(scope, subject, policy.levels))
+        print("※ 전체등급: {0} 전체 성적 기준 {1}등급".format(scope, policy.levels))
     else:
         print(f"{year}학년 {subject}: 해당 학년 데이터가 없습니다.")
     print("\n✅ 추가 기능 분석이 완료되었습니다!\n")
 
+def run_batch(df, years=AVAILABLE_GRADE_YEARS, subjects=None, out_dir='reports', workers=1,
+              figure_workers=FIGURE_WORKERS):
+    """
+    입력 없이(stdin을 사용하지 않고) 필수 과제 분석과 추가 기능 분석 결과를 한 번에
+    계산해 out_dir에 표(CSV), 요약(JSON), 그래프(PNG)로 저장합니다.
+
+    Args:
+        df (pd.DataFrame): 학생 성적 데이터가 담긴 DataFrame.
+        years (list): 분석할 학년 목록.
+        subjects (list, optional): 과목별 상위 10명 표를 저장할 과목 목록. 지정하지 않으면 전체 과목.
+                                   필수 과제 분석 표와 총점/전체 석차/전체 등급은 항상
+                                   detect_subjects로 찾은 전체 과목 기준으로 계산합니다.
+        out_dir (str): 결과를 저장할 디렉터리.
+        workers (int): 석차/등급 계산에 사용할 프로세스 수 (1이면 병렬 처리 없이 실행).
+        figure_workers (int, optional): 그래프를 그릴 프로세스 수 (None이면 CPU 코어 수).
+                                        입력 집계값이 이전 실행과 같은 그래프는 다시 그리지 않습니다.
+
+    Returns:
+        list: 저장한 파일 경로 목록.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    df = select_years(df, years)
+    # 총점은 대화형 메뉴/학생 조회와 같이 전체 과목 합으로 계산하고, subjects는 과목별 표 선택에만 사용
+    all_subjects = detect_subjects(df)
+    subjects = all_subjects if subjects is None else list(subjects)
+    written = []
+
+    def output_path(name):
+        path = os.path.join(out_dir, name)
+        written.append(path)
+        return path
+
+    # 필수 과제 분석 표/그래프
+    tables = compute_basic_tables(df, all_subjects)
+    for name, table in tables.items():
+        table.to_csv(output_path(f'{name}.csv'), encoding='utf-8-sig')
+    written.extend(render_figures(basic_figures(df, tables, all_subjects), out_dir, figure_workers))
 
+    # 추가 기능 분석: 전체 학년 × 과목 석차/등급을 한 번에 계산한 뒤 학년/과목별로 나눠 저장
+    for name, table in compute_rank_tables(df, years, all_subjects, workers, top_subjects=subjects).items():
+        table.to_csv(output_path(f'{name}.csv'), index=False, encoding='utf-8-sig')
 
-def run_student_id_lookup(df):
+    summary = {
+        '행수': int(len(df)),
+        '학년': [int(year) for year in years],
+        '과목': list(all_subjects),
+        '상위10명_과목': list(subjects),
+        '등급제': GRADE_SYSTEM,
+        '상위10명_평균총점': float(tables['상위10명']['총점'].mean()),
+        '하위10명_평균총점': float(tables['하위10명']['총점'].mean()),
+    }
+    if '회귀' in tables:
+        summary['회귀'] = {key: float(value) for key, value in tables['회귀'].items()}
+    with open(output_path('summary.json'), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    return written
+
+def run_student_id_lookup(df, index=None):
     print("\n" + "="*50)
     print("학생 ID 조회 기능")
     print("="*50)
-    # 사용 가능한 과목: 수학, 영어, 과학, 전체
-    subject_options = DEFAULT_SUBJECTS + ["전체"]
+    # 석차/등급은 데이터셋당 한 번만 계산해 두고 조회 시 재사용
+    if index is None:
+        index = get_grade_index(df)
+    # 사용 가능한 과목: 데이터에 있는 과목 (예: 수학, 영어, 과학), 전체
+    subject_options = index.subjects + ["전체"]
     print(f"사용 가능한 과목: {subject_options}")
     # 예시 학생 ID: S1000 ~ S1119
     print("예시 학생 ID: S1000 ~ S1119")
@@ -209,7 +405,7 @@ def run_student_id_lookup(df):
         if student_id.lower() == 'q':
             print("학생 조회를 종료합니다.")
             break
-        if student_id not in df['학생ID'].values:
+        if student_id not in index:
             print(f"'{student_id}' 학생을 찾을 수 없습니다. 다시 시도해주세요.")
             continue
         # 과목 선택
@@ -221,82 +417,125 @@ def run_student_id_lookup(df):
             if 0 <= subject_choice < len(subject_options):
                 subject = subject_options[subject_choice]
             else:
-                print("잘못된 선택입니다. 수학으로 기본 설정합니다.")
-                subject = "수학"
+                subject = subject_options[0]
+                print(f"잘못된 선택입니다. {subject}(으)로 기본 설정합니다.")
         except ValueError:
-            print("잘못된 입력입니다. 수학으로 기본 설정합니다.")
-            subject = "수학"
-        student_data = df[df['학생ID'] == student_id]
-        if not student_data.empty:
-            year = student_data['학년'].iloc[0]
-            try:
-                if subject == "전체":
-                    # 해당 학년 데이터만 사용
-                    year_df = df[df['학년'] == year].copy()
-                    if student_id not in year_df['학생ID'].values:
-                        print(f"\n{student_id} 학생의 전체 성적 정보를 찾을 수 없습니다.")
-                        continue
-                    # 총점, 평균, 전체등급, 전체석차 계산
-                    df_with_grades = assign_grades(year_df)
-                    # 총점 기준 석차
-                    df_with_grades['전체석차'] = df_with_grades['총점'].rank(ascending=False, method='min').astype(int)
-                    # 과목별 등급
-                    from grade_calculator import assign_subject_grades
-                    subj_grades = {}
-                    for subj in DEFAULT_SUBJECTS:
-                        subj_df = assign_subject_grades(year_df[['학생ID', subj]], subj)
-                        subj_grade = subj_df[subj_df['학생ID'] == student_id]['등급'].values[0]
-                        subj_grades[subj] = subj_grade
-                    row = df_with_grades[df_with_grades['학생ID'] == student_id]
-                    # 출력
-                    print(f"\n{student_id} 학생 정보 (전체):")
+            subject = subject_options[0]
+            print(f"잘못된 입력입니다. {subject}(으)로 기본 설정합니다.")
+        print_student_info(df, index, student_id, subject)
+
+def print_student_info(df, index, student_id, subject):
+    """학생 한 명의 과목(또는 '전체') 석차/등급 정보를 출력합니다."""
+    record = index.get(student_id)
+    if record is not None:
+        year = record['학년']
+        try:
+            if subject == "전체":
+                if record['전체등급'] is None:
+                    print(f"\n{student_id} 학생의 전체 성적 정보를 찾을 수 없습니다.")
+                    return
+                # 출력
+                print(f"\n{student_id} 학생 정보 (전체):")
+                print("-" * 40)
+                # 학생ID, 반, 과목별 점수와 과목등급, 전체등급, 전체석차
+                info = [
+                    f"학생ID: {student_id}",
+                    f"학년: {year}",
+                    f"반: {record['반']}",
+                    *(f"{subj}: {score} (등급 {record['과목등급'][subj]})" for subj, score in record['점수'].items()),
+                    f"총점: {int(record['총점'])}",
+                    f"평균: {record['평균']:.1f}",
+                    f"전체등급: {record['전체등급']}",
+                    f"전체석차: {record['전체석차']}"
+                ]
+                print("\n".join(info))
+            else:
+                student_info = lookup_student_info(df, year, subject, student_id, index=index)
+                if not student_info.empty:
+                    # 학년 정보 없이 출력
+                    print(f"\n{student_id} 학생 정보 ({subject}):")
                     print("-" * 40)
-                    # 학생ID, 반, 수학, 영어, 과학, 각 과목등급, 전체등급, 전체석차
-                    info = [
-                        f"학생ID: {student_id}",
-                        f"학년: {row['학년'].values[0]}",
-                        f"반: {row['반'].values[0]}",
-                        f"수학: {row['수학'].values[0]} (등급 {subj_grades['수학']})",
-                        f"영어: {row['영어'].values[0]} (등급 {subj_grades['영어']})",
-                        f"과학: {row['과학'].values[0]} (등급 {subj_grades['과학']})",
-                        f"총점: {int(row['총점'].values[0])}",
-                        f"평균: {row['평균'].values[0]:.1f}",
-                        f"전체등급: {row['등급'].values[0]}",
-                        f"전체석차: {row['전체석차'].values[0]}"
-                    ]
-                    print("\n".join(info))
+                    # 학년 컬럼 제외
+                    display_cols = [col for col in student_info.columns if col != '학년']
+                    print(student_info[display_cols].to_string(index=False))
                 else:
-                    student_info = lookup_student_info(df, year, subject, student_id)
-                    if not student_info.empty:
-                        # 학년 정보 없이 출력
-                        print(f"\n{student_id} 학생 정보 ({subject}):")
-                        print("-" * 40)
-                        # 학년 컬럼 제외
-                        display_cols = [col for col in student_info.columns if col != '학년']
-                        print(student_info[display_cols].to_string(index=False))
-                    else:
-                        print(f"\n{student_id} 학생의 {subject} 정보를 찾을 수 없습니다.")
-            except Exception as e:
-                print(f"\n학생 조회 중 오류: {e}")
-        else:
-            print(f"{student_id} 학생의 정보를 찾을 수 없습니다.")
+                    print(f"\n{student_id} 학생의 {subject} 정보를 찾을 수 없습니다.")
+        except Exception as e:
+            print(f"\n학생 조회 중 오류: {e}")
+    else:
+        print(f"{student_id} 학생의 정보를 찾을 수 없습니다.")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="GradeScope-EDA 학생 성적 분석 시스템")
+    parser.add_argument('--data', default='student_scores.csv', help="학생 성적 CSV 파일 경로")
+    parser.add_argument('--batch', action='store_true',
+                        help="메뉴 입력 없이 모든 분석 결과를 파일로 저장합니다")
+    parser.add_argument('--years', nargs='+', type=int, choices=AVAILABLE_GRADE_YEARS,
+                        default=AVAILABLE_GRADE_YEARS, help="배치 모드에서 분석할 학년")
+    parser.add_argument('--subjects', nargs='+',
+                        help="배치 모드에서 과목별 상위 10명 표를 저장할 과목 (지정하지 않으면 데이터에 있는 과목 전체, "
+                             "총점/전체 석차/전체 등급은 항상 전체 과목 기준)")
+    parser.add_argument('--out', default='reports', help="배치 모드 결과 저장 디렉터리")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="배치 모드 석차/등급 계산 프로세스 수 (0이면 CPU 코어 수)")
+    parser.add_argument('--figure-workers', type=int, default=FIGURE_WORKERS,
+                        help="배치 모드 그래프 작성 프로세스 수 (0 또는 생략하면 CPU 코어 수)")
+    parser.add_argument('--profile', metavar='PATH',
+                        help="단계별 호출 수/누적 시간/처리 행 수를 측정해 JSON으로 저장합니다")
+    parser.add_argument('--cprofile', metavar='PATH',
+                        help="실행 전체를 cProfile로 측정해 pstats 파일로 저장합니다")
+    parser.add_argument('--lookup', metavar='학생ID',
+                        help="메뉴 없이 학생 한 명의 석차/등급 정보만 출력하고 종료합니다")
+    parser.add_argument('--subject', default='전체',
+                        help="--lookup으로 조회할 과목 (데이터에 있는 과목 또는 '전체')")
+    return parser.parse_args(argv)
 
-def main():
-    df = load_data('student_scores.csv')
+def run(args):
+    # 스키마 자료형으로 읽고, 다음 실행부터는 컬럼형 캐시를 사용
+    df = load_data(args.data, typed=True)
+    # 과목 목록은 데이터셋당 한 번만 정해 모든 분석(표, 석차/등급, 학생 조회)에 같은 목록을 사용
+    subjects = detect_subjects(df)
+    unknown = [subject for subject in (args.subjects or []) + [args.subject] if subject not in subjects + ['전체']]
+    if unknown:
+        raise SystemExit(f"데이터에 없는 과목입니다: {unknown} (사용 가능한 과목: {subjects})")
+    if args.batch:
+        written = run_batch(df, args.years, args.subjects, args.out, args.workers or None,
+                            args.figure_workers or None)
+        print(f"{len(written)}개 파일을 {args.out}에 저장했습니다.")
+        return
+    index = get_grade_index(df, subjects)
+    if args.lookup:
+        print_student_info(df, index, args.lookup, args.subject)
+        return
     while True:
         show_main_menu()
         choice = input("\n원하는 기능을 선택하세요 (1/2/3, 종료하려면 'q'): ").strip()
         if choice == '1':
-            run_basic_analysis(df)
+            run_basic_analysis(df, subjects)
         elif choice == '2':
-            run_additional_analysis(df)
+            run_additional_analysis(df, subjects)
         elif choice == '3':
-            run_student_id_lookup(df)
+            run_student_id_lookup(df, index)
         elif choice.lower() == 'q':
             print("프로그램을 종료합니다.")
             break
         else:
             print("잘못된 입력입니다. 1, 2, 3 또는 q 중에서 선택하세요.")
 
+def main(argv=None):
+    args = parse_args(argv)
+    if args.profile:
+        profiling.enable()
+    try:
+        if args.cprofile:
+            with profiling.cprofile(args.cprofile):
+                run(args)
+        else:
+            run(args)
+    finally:
+        if args.profile:
+            profiling.dump_json(args.profile)
+            print(profiling.format_report())
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
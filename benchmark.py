@@ -0,0 +1,280 @@
+# GradeScope-EDA 성능 측정: 합성 명단 생성 + 로딩/등급/조회/분석 단계별 시간·메모리 측정
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from config import AVAILABLE_GRADE_YEARS, DEFAULT_SUBJECTS
+
+# 한 번에 생성/저장할 최대 행 수 (10^7행 명단도 일정한 메모리로 CSV 생성)
+GENERATE_CHUNK_ROWS = 1_000_000
+# 시작 시간 측정에 사용할 명단 크기와 기본 허용 시간(초)
+STARTUP_ROWS = 1_000
+STARTUP_BUDGET_SECONDS = 2.0
+ANALYSIS_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'analysis.py')
+CLASSES = ['A', 'B', 'C', 'D', 'E', 'F']
+GENDERS = ['F', 'M']
+
+
+def generate_roster(n, seed=0, start=0):
+    """
+    student_scores.csv와 같은 스키마의 합성 학생 명단을 생성합니다.
+
+    같은 (n, seed, start)이면 항상 같은 명단이 생성됩니다.
+
+    Args:
+        n (int): 생성할 학생 수.
+        seed (int): 난수 시드.
+        start (int): 학생ID 시작 번호 오프셋 (덩어리 단위 생성 시 사용).
+
+    Returns:
+        pd.DataFrame: 학생ID, 학년, 반, 성별, 출석률(%), 수학, 영어, 과학 컬럼을 가진 DataFrame.
+    """
+    rng = np.random.default_rng([seed, start])
+    attendance = np.clip(rng.normal(92, 5.5, n), 60, 100).round(1)
+    # 출석률과 약한 양의 상관, 과목 간 중간 정도 상관을 갖도록 공통 요인을 섞음
+    ability = rng.normal(0, 1, n)
+    roster = {
+        '학생ID': [f'S{1000 + i}' for i in range(start, start + n)],
+        '학년': rng.choice(AVAILABLE_GRADE_YEARS, n),
+        '반': rng.choice(CLASSES, n),
+        '성별': rng.choice(GENDERS, n),
+        '출석률(%)': attendance,
+    }
+    for subject in DEFAULT_SUBJECTS:
+        score = 71 + 11 * ability + 0.6 * (attendance - 92) + rng.normal(0, 9, n)
+        roster[subject] = np.clip(score.round(), 0, 100).astype(int)
+    return pd.DataFrame(roster)
+
+
+def write_roster_csv(n, path, seed=0):
+    """합성 명단을 GENERATE_CHUNK_ROWS 행씩 생성해 CSV로 저장합니다."""
+    for start in range(0, n, GENERATE_CHUNK_ROWS):
+        chunk = generate_roster(min(GENERATE_CHUNK_ROWS, n - start), seed, start)
+        chunk.to_csv(path, mode='w' if start == 0 else 'a', header=start == 0, index=False)
+
+
+def measure(func, repeat=1, memory=True):
+    """
+    func()의 실행 시간(repeat회 중 최솟값)과 최대 메모리 사용량을 측정합니다.
+
+    메모리는 측정 오버헤드가 시간에 섞이지 않도록 tracemalloc을 켠 별도 실행에서 잽니다.
+
+    Returns:
+        dict: {'seconds': 실행 시간, 'peak_mb': 최대 메모리(MB) 또는 None}
+    """
+    seconds = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        seconds = min(seconds, time.perf_counter() - started)
+    peak_mb = None
+    if memory:
+        tracemalloc.start()
+        try:
+            func()
+            peak_mb = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+        finally:
+            tracemalloc.stop()
+    return {'seconds': seconds, 'peak_mb': peak_mb}
+
+
+def benchmark_cases(csv_path, lookups=1000, seed=0):
+    """
+    측정할 (이름, 함수) 목록을 만듭니다. 각 함수는 캐시를 사용하지 않고 매번 다시 계산합니다.
+    """
+    from aggregation_cache import clear_cache
+    from analysis import BASIC_ANALYSIS_STAGES
+    from data_loader import load_data
+    from grade_calculator import assign_grades, assign_subject_grades
+    from grade_index import GradeIndex
+    from rank_and_grade import calculate_rank_and_grade, calculate_all_ranks_and_grades
+    from streaming_stats import stream_stats
+    from student_id_lookup import lookup_student_info
+
+    df = load_data(csv_path)
+    index = GradeIndex.from_frame(df)
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(df), min(lookups, len(df)))
+    queries = [(df['학년'].iat[i], DEFAULT_SUBJECTS[i % len(DEFAULT_SUBJECTS)], df['학생ID'].iat[i]) for i in picks]
+
+    def load_typed():
+        clear_cache()
+        load_data(csv_path, typed=True, use_cache=False)
+
+    def rank_every_year_and_subject():
+        for year in AVAILABLE_GRADE_YEARS:
+            for subject in DEFAULT_SUBJECTS:
+                calculate_rank_and_grade(df, year, subject)
+
+    def lookup_many():
+        for year, subject, student_id in queries:
+            lookup_student_info(df, year, subject, student_id, index=index)
+
+    cases = [
+        ('load_data', lambda: load_data(csv_path)),
+        ('load_data_typed', load_typed),
+        ('assign_grades', lambda: assign_grades(df)),
+        ('assign_subject_grades', lambda: [assign_subject_grades(df, subject) for subject in DEFAULT_SUBJECTS]),
+        ('calculate_rank_and_grade', rank_every_year_and_subject),
+        ('calculate_all_ranks_and_grades', lambda: calculate_all_ranks_and_grades(df)),
+        ('stream_stats', lambda: stream_stats(csv_path)),
+        ('grade_index_build', lambda: (clear_cache(), GradeIndex.from_frame(df))),
+        ('lookup_student_info', lookup_many),
+    ]
+    for name, stage in BASIC_ANALYSIS_STAGES:
+        cases.append((f'basic_analysis_{name}', lambda stage=stage: (clear_cache(), stage(df))))
+    return cases
+
+
+def run_benchmarks(sizes, seed=0, repeat=1, memory=True, lookups=1000, only=None):
+    """
+    크기별 합성 명단을 만들어 모든 측정 항목을 실행합니다.
+
+    Returns:
+        dict: {'meta': 실행 환경, 'results': {크기: {항목: 측정 결과}}}
+    """
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'seed': seed,
+            'repeat': repeat,
+            'lookups': lookups,
+        },
+        'results': {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            csv_path = os.path.join(tmp, f'roster_{n}.csv')
+            write_roster_csv(n, csv_path, seed)
+            results = {}
+            for name, func in benchmark_cases(csv_path, lookups, seed):
+                if only and not any(name.startswith(prefix) for prefix in only):
+                    continue
+                results[name] = measure(func, repeat, memory)
+                peak = results[name]['peak_mb']
+                print(f"[{n:>9}] {name:<40} {results[name]['seconds']:9.4f}s"
+                      + (f" {peak:9.1f}MB" if peak is not None else ""))
+            report['results'][str(n)] = results
+            os.remove(csv_path)
+    return report
+
+
+def measure_startup(args, repeat=1):
+    """
+    새 파이썬 프로세스로 `python analysis.py args...`를 실행해 종료까지 걸린 시간(repeat회 중 최솟값)을 잽니다.
+    모듈 import 시간이 모두 포함되므로 콜드 스타트 시간을 확인할 수 있습니다.
+    """
+    seconds = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, ANALYSIS_SCRIPT, *args], check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        seconds = min(seconds, time.perf_counter() - started)
+    return seconds
+
+
+def run_startup_checks(repeat=1, seed=0):
+    """
+    `analysis.py --help`와 학생 한 명 조회(--lookup)의 시작 시간을 측정합니다.
+
+    Returns:
+        dict: 항목 → 실행 시간(초)
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'roster_startup.csv')
+        write_roster_csv(STARTUP_ROWS, csv_path, seed)
+        # 첫 실행에서 컬럼형 캐시를 만들어 두고, 이후 실행 시간만 측정
+        measure_startup(['--data', csv_path, '--lookup', 'S1000'])
+        results = {
+            'startup_help': measure_startup(['--help'], repeat),
+            'startup_lookup': measure_startup(['--data', csv_path, '--lookup', 'S1000', '--subject', '전체'], repeat),
+        }
+    for name, seconds in results.items():
+        print(f"[startup] {name:<40} {seconds:9.4f}s")
+    return results
+
+
+def compare_reports(current, baseline, tolerance=0.2, min_seconds=0.005, min_mb=1.0):
+    """
+    현재 측정 결과를 기준(baseline) 결과와 비교해 느려졌거나 메모리를 더 쓰게 된 항목을 찾습니다.
+
+    Args:
+        tolerance (float): 허용 비율 (0.2이면 기준보다 20%까지 느려지거나 메모리가 늘어나는 것은 허용).
+        min_seconds (float): 이보다 짧은 측정은 잡음이 크므로 시간을 비교하지 않습니다.
+        min_mb (float): 이보다 작은 최대 메모리는 잡음이 크므로 메모리를 비교하지 않습니다.
+                        (어느 한쪽을 --no-memory로 측정해 peak_mb가 없는 항목도 비교하지 않습니다.)
+
+    Returns:
+        list: (크기, 항목, 지표('seconds' 또는 'peak_mb'), 기준 값, 현재 값) 형태의 성능 저하 목록.
+    """
+    regressions = []
+    for size, results in current['results'].items():
+        for name, result in results.items():
+            base = baseline.get('results', {}).get(size, {}).get(name)
+            if base is None:
+                continue
+            for metric, minimum in (('seconds', min_seconds), ('peak_mb', min_mb)):
+                before, after = base.get(metric), result.get(metric)
+                if before is None or after is None or before < minimum:
+                    continue
+                if after > before * (1 + tolerance):
+                    regressions.append((size, name, metric, before, after))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="GradeScope-EDA 성능 측정")
+    parser.add_argument('--sizes', nargs='+', type=int, default=[1_000, 10_000, 100_000],
+                        help="측정할 명단 크기 (10^3 ~ 10^7)")
+    parser.add_argument('--seed', type=int, default=0, help="합성 명단 난수 시드")
+    parser.add_argument('--repeat', type=int, default=3, help="시간 측정 반복 횟수 (최솟값 사용)")
+    parser.add_argument('--lookups', type=int, default=1000, help="학생 조회 측정 횟수")
+    parser.add_argument('--only', nargs='+', help="이 이름으로 시작하는 항목만 측정")
+    parser.add_argument('--no-memory', action='store_true', help="최대 메모리 측정을 생략합니다")
+    parser.add_argument('--out', help="측정 결과를 저장할 JSON 경로")
+    parser.add_argument('--compare', help="비교할 기준(baseline) JSON 경로")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="허용 성능 저하 비율")
+    parser.add_argument('--startup-budget', type=float, nargs='?', const=STARTUP_BUDGET_SECONDS, metavar='SECONDS',
+                        help=f"--help/학생 조회 시작 시간이 이 값(초, 기본 {STARTUP_BUDGET_SECONDS})을 넘으면 실패합니다")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.sizes, args.seed, args.repeat, not args.no_memory, args.lookups, args.only)
+    over_budget = []
+    if args.startup_budget is not None:
+        report['startup'] = run_startup_checks(args.repeat, args.seed)
+        over_budget = [(name, seconds) for name, seconds in report['startup'].items()
+                       if seconds > args.startup_budget]
+        for name, seconds in over_budget:
+            print(f"시작 시간 초과: {name} {seconds:.3f}s > {args.startup_budget:.3f}s")
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"측정 결과를 {args.out}에 저장했습니다.")
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_reports(report, baseline, args.tolerance)
+        for size, name, metric, before, after in regressions:
+            if metric == 'seconds':
+                print(f"성능 저하: [{size}] {name} {before:.4f}s → {after:.4f}s ({after / before - 1:+.0%})")
+            else:
+                print(f"메모리 증가: [{size}] {name} {before:.1f}MB → {after:.1f}MB ({after / before - 1:+.0%})")
+        if regressions:
+            return 1
+        print("기준 대비 성능 저하가 없습니다.")
+    return 1 if over_budget else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
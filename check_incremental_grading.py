@@ -0,0 +1,85 @@
+# 증분 등급 계산기(incremental_grading.py)의 결과가 매번 전체를 다시 계산한 결과와 같은지 확인하는 검증 스크립트
+import argparse
+import random
+
+from benchmark import generate_roster
+from config import DEFAULT_SUBJECTS, GRADE_POLICIES
+from data_loader import SCORE_RANGE
+from incremental_grading import IncrementalGrader
+from rank_and_grade import calculate_all_ranks_and_grades
+
+
+def full_state(df, policy):
+    """전체 재계산 결과를 (학생ID, 과목 또는 '전체') → (석차, 등급) dict로 반환합니다."""
+    table = calculate_all_ranks_and_grades(df, policy=policy)
+    state = {}
+    for row in table.to_dict('records'):
+        for subject in DEFAULT_SUBJECTS:
+            state[row['학생ID'], subject] = (int(row[f'{subject}석차']), int(row[f'{subject}등급']))
+        state[row['학생ID'], '전체'] = (int(row['전체석차']), int(row['전체등급']))
+    return state
+
+
+def check_incremental(rows=2000, batches=40, batch_size=20, seed=0, policy='5등급'):
+    """
+    무작위 점수 수정 묶음을 batches번 반영하면서, 매번 다음 두 가지를 확인합니다.
+
+    - 모든 학생/과목의 (석차, 등급)이 전체 재계산 결과와 같은지
+    - apply()가 돌려준 변경 목록이 실제로 바뀐 학생/과목 및 이전/새 값과 같은지
+
+    Returns:
+        list: 불일치 설명 목록 (비어 있으면 통과).
+    """
+    rng = random.Random(seed)
+    df = generate_roster(rows, seed)
+    positions = {student_id: i for i, student_id in enumerate(df['학생ID'])}
+    grader = IncrementalGrader(df, policy=policy)
+    before = full_state(df, policy)
+    failures = [f"초기 상태 불일치: {key}" for key, value in before.items()
+                if grader.rank_and_grade(*key) != value]
+
+    low, high = SCORE_RANGE
+    for batch in range(batches):
+        deltas = [(rng.choice(df['학생ID']), rng.choice(DEFAULT_SUBJECTS), rng.randint(low, high))
+                  for _ in range(batch_size)]
+        changes = grader.apply(deltas)
+        for student_id, subject, score in deltas:
+            df.iloc[positions[student_id], df.columns.get_loc(subject)] = score
+        after = full_state(df, policy)
+
+        failures += [f"{batch}번째 묶음 후 상태 불일치: {key}" for key, value in after.items()
+                     if grader.rank_and_grade(*key) != value]
+        expected = {key: (before[key], after[key]) for key in after if before[key] != after[key]}
+        reported = {(row['학생ID'], row['과목']): ((row['이전석차'], row['이전등급']), (row['석차'], row['등급']))
+                    for row in changes.to_dict('records')}
+        if reported != expected:
+            failures.append(f"{batch}번째 묶음의 변경 목록 불일치: "
+                            f"누락 {len(expected.keys() - reported.keys())}건, "
+                            f"초과 {len(reported.keys() - expected.keys())}건, "
+                            f"값 차이 {sum(reported[k] != expected[k] for k in reported.keys() & expected.keys())}건")
+        before = after
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="증분 등급 계산기와 전체 재계산 결과 비교")
+    parser.add_argument('--rows', type=int, default=2000, help="합성 명단 학생 수")
+    parser.add_argument('--batches', type=int, default=40, help="점수 수정 묶음 수")
+    parser.add_argument('--batch-size', type=int, default=20, help="묶음 하나의 점수 수정 수")
+    parser.add_argument('--seed', type=int, default=0, help="난수 시드")
+    parser.add_argument('--policies', nargs='+', choices=list(GRADE_POLICIES), default=list(GRADE_POLICIES),
+                        help="확인할 등급제")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for policy in args.policies:
+        failures = check_incremental(args.rows, args.batches, args.batch_size, args.seed, policy)
+        print(f"{policy}: {'통과' if not failures else f'실패 {len(failures)}건'}")
+        for failure in failures[:10]:
+            print(f"  - {failure}")
+        failed |= bool(failures)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,87 @@
+# 병렬 석차/등급 계산(parallel_grading.py) 결과와 배치 모드 표가 직렬로 계산한 결과와 정확히 같은지 확인하는 검증 스크립트
+import argparse
+
+import numpy as np
+import pandas as pd
+from analysis import compute_rank_tables
+from benchmark import generate_roster
+from config import AVAILABLE_GRADE_YEARS, GRADE_POLICIES
+from data_loader import detect_subjects
+from parallel_grading import grade_in_parallel, grading_groups
+from rank_and_grade import calculate_all_ranks_and_grades
+
+
+def sample_rosters(rows, schools, seed=0):
+    """학교 컬럼이 없는 명단과, 학교 schools개로 나뉜 명단을 만듭니다."""
+    roster = generate_roster(rows, seed)
+    rng = np.random.default_rng(seed)
+    with_schools = roster.assign(학교=rng.choice([f'학교{i}' for i in range(schools)], rows))
+    return {'학년 단위': roster, f'학교 {schools}개 × 학년 단위': with_schools}
+
+
+def check_parallel(df, workers=2, policy='5등급'):
+    """
+    가능한 모든 shard_by 기준으로 grade_in_parallel을 실행해 calculate_all_ranks_and_grades와
+    행 순서/자료형까지 같은지 확인합니다.
+
+    Returns:
+        list: 불일치 설명 목록 (비어 있으면 통과).
+    """
+    group_by = grading_groups(df)
+    expected = calculate_all_ranks_and_grades(df, group_by=group_by, policy=policy)
+    failures = []
+    for shard_by in group_by:
+        result = grade_in_parallel(df, shard_by=shard_by, workers=workers, policy=policy)
+        try:
+            pd.testing.assert_frame_equal(result, expected)
+        except AssertionError as e:
+            failures.append(f"shard_by={shard_by}: {str(e).splitlines()[0]}")
+    return failures
+
+
+def check_batch(df, workers=2):
+    """
+    배치 모드(analysis.run_batch)가 저장하는 석차/등급표와 상위 10명 표가
+    workers=1(직렬)과 workers(병렬)에서 같은지 확인합니다.
+
+    Returns:
+        list: 불일치 설명 목록 (비어 있으면 통과).
+    """
+    subjects = detect_subjects(df)
+    serial = compute_rank_tables(df, AVAILABLE_GRADE_YEARS, subjects, workers=1)
+    parallel = compute_rank_tables(df, AVAILABLE_GRADE_YEARS, subjects, workers=workers)
+    failures = []
+    for name, expected in serial.items():
+        try:
+            pd.testing.assert_frame_equal(parallel[name], expected)
+        except AssertionError as e:
+            failures.append(f"배치 {name}: {str(e).splitlines()[0]}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="병렬 석차/등급 계산과 한 번에 계산한 결과 비교")
+    parser.add_argument('--rows', type=int, default=50_000, help="합성 명단 학생 수")
+    parser.add_argument('--schools', type=int, default=8, help="학교 수")
+    parser.add_argument('--workers', type=int, default=2, help="작업 프로세스 수")
+    parser.add_argument('--seed', type=int, default=0, help="난수 시드")
+    parser.add_argument('--policies', nargs='+', choices=list(GRADE_POLICIES), default=list(GRADE_POLICIES),
+                        help="확인할 등급제")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for name, df in sample_rosters(args.rows, args.schools, args.seed).items():
+        checks = [(policy, lambda policy=policy: check_parallel(df, args.workers, policy))
+                  for policy in args.policies]
+        checks.append(('배치 모드', lambda: check_batch(df, args.workers)))
+        for label, check in checks:
+            failures = check()
+            print(f"{name} / {label}: {'통과' if not failures else f'실패 {len(failures)}건'}")
+            for failure in failures:
+                print(f"  - {failure}")
+            failed |= bool(failures)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,3 +1,62 @@
 GRADE_SYSTEM = "5등급"
+
+# 등급제 정의 (GRADE_SYSTEM에는 이 중 하나의 이름을 지정)
+# - relative: 석차 비율제. ratios는 1등급부터의 인원 비율이며, 나누고 남는 인원은 마지막 등급에 포함
+#   ties='order'이면 동점자도 원래 행 순서대로 경계에서 나뉘고, 'min'이면 동점자는 모두 같은(높은) 등급
+# - absolute: 절대평가. thresholds는 1등급부터의 점수 하한 (총점은 과목 수를 곱한 하한 적용)
+GRADE_POLICIES = {
+    "5등급": {"type": "relative", "ratios": [0.10, 0.24, 0.32, 0.24, 0.10], "ties": "order"},
+    "5등급(동점 동일등급)": {"type": "relative", "ratios": [0.10, 0.24, 0.32, 0.24, 0.10], "ties": "min"},
+    "9등급": {"type": "relative", "ratios": [0.04, 0.07, 0.12, 0.17, 0.20, 0.17, 0.12, 0.07, 0.04], "ties": "order"},
+    "9등급(동점 동일등급)": {"type": "relative", "ratios": [0.04, 0.07, 0.12, 0.17, 0.20, 0.17, 0.12, 0.07, 0.04], "ties": "min"},
+    "절대평가": {"type": "absolute", "thresholds": [90, 80, 70, 60]},
+}
+
 AVAILABLE_GRADE_YEARS = [1, 2, 3]
-DEFAULT_SUBJECTS = ["수학", "영어", "과학"]
\ No newline at end of file
+DEFAULT_SUBJECTS = ["수학", "영어", "과학"]
+
+# DEFAULT_SUBJECTS 외에 과목으로 취급할 컬럼 이름 정규식 (None이면 DEFAULT_SUBJECTS만 과목으로 사용)
+# 예: r"^(국어|사회)$" — 일치하는 숫자형 컬럼만 과목으로 보고 점수 범위를 검사합니다.
+SUBJECT_COLUMN_PATTERN = None
+
+# typed 모드 CSV 로딩 시 한 번에 읽을 행 수
+LOAD_CHUNKSIZE = 100_000
+
+# typed 모드에서 CSV 옆에 컬럼형(Feather) 캐시를 만들어 재사용할지 여부
+LOAD_CACHE = True
+
+# 데이터셋별 집계 결과(기술통계, 상관계수, 등급표 등) 캐시 최대 항목 수
+AGGREGATION_CACHE_SIZE = 64
+
+# 병렬 석차/등급 계산 작업 프로세스 수 (None이면 CPU 코어 수)
+GRADING_WORKERS = None
+
+# 스트리밍 통계의 분위수(중앙값/사분위수) 스케치 칸 간격 (점수·출석률이 이 간격의 배수면 정확한 값)
+QUANTILE_RESOLUTION = 0.1
+
+# 조회 서버(query_server.py) 기본 주소/포트와 top_k 요청의 최대 k
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+SERVER_TOP_K_LIMIT = 1000
+
+# 조회 서버 reload 요청으로 불러올 수 있는 CSV가 있는 디렉터리 (None이면 서버를 시작할 때 지정한 CSV의 디렉터리)
+SERVER_DATA_DIR = None
+
+# 배치 모드 그래프를 그릴 작업 프로세스 수 (None이면 CPU 코어 수)
+FIGURE_WORKERS = None
+
+# 출석률 vs 총점 그래프에서 점이 이보다 많으면 산점도 대신 밀도 격자(FIGURE_DENSITY_BINS × FIGURE_DENSITY_BINS)로 그림
+FIGURE_SCATTER_MAX_POINTS = 20_000
+FIGURE_DENSITY_BINS = 60
+
+# 박스플롯에 그릴 그룹별 이상치 점의 최대 개수 (넘으면 크기순으로 고르게 골라 그림)
+FIGURE_BOX_MAX_OUTLIERS = 1000
+
+# 입력 집계값이 같은 그래프의 PNG를 재사용하기 위한 캐시 디렉터리
+FIGURE_CACHE_DIR = ".figure_cache"
+
+# 학기별 명단/석차/등급을 쌓아 두는 저장소(history_store.py) 디렉터리
+HISTORY_STORE_DIR = "history"
+
+# 학기별 저장 파일의 행 그룹 크기 (학생ID 순으로 정렬해 저장하므로 학생 한 명 조회 시 행 그룹 하나만 읽음)
+HISTORY_ROW_GROUP_SIZE = 65_536
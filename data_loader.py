@@ -1,6 +1,249 @@
+import hashlib
+import json
+import os
+import re
+import tracemalloc
+
 import pandas as pd
+from config import AVAILABLE_GRADE_YEARS, DEFAULT_SUBJECTS, LOAD_CHUNKSIZE, LOAD_CACHE, SUBJECT_COLUMN_PATTERN
+from profiling import profiled
+
+# 학생 성적 CSV 스키마 (typed 모드에서 사용)
+# 점수/학년은 결측치·범위 검사 후 정수형으로 변환하기 위해 우선 실수형으로 읽습니다.
+CSV_DTYPES = {
+    '학생ID': 'str',
+    '학년': 'float32',
+    '반': 'category',
+    '성별': 'category',
+    '출석률(%)': 'float32',
+    **{subject: 'float32' for subject in DEFAULT_SUBJECTS},
+}
+SCORE_DTYPE = 'uint8'
+YEAR_DTYPE = 'int8'
+SCORE_RANGE = (0, 100)
+ATTENDANCE_RANGE = (0, 100)
+
+# 과목 점수가 아닌 컬럼 (스키마에서 과목 컬럼을 찾을 때 제외)
+NON_SUBJECT_COLUMNS = ('학생ID', '학교', '학년', '반', '성별', '출석률(%)', '총점', '평균', '등급')
+
+# typed 모드 결과를 CSV 옆에 저장하는 컬럼형(Feather) 캐시
+CACHE_SUFFIX = '.cache.feather'
+CACHE_VERSION = '1'
+_CACHE_META_KEY = b'gradescope_source'
+
+
+def detect_subjects(df, subjects=DEFAULT_SUBJECTS, pattern=SUBJECT_COLUMN_PATTERN):
+    """
+    DataFrame 스키마에서 과목 점수 컬럼을 찾습니다.
+
+    subjects(config.DEFAULT_SUBJECTS) 중 있는 과목을 설정 순서대로 먼저 두고, pattern
+    (config.SUBJECT_COLUMN_PATTERN)을 지정한 경우에만 이름이 일치하는 그 밖의 숫자형 컬럼
+    (NON_SUBJECT_COLUMNS와 '~석차'/'~등급' 결과 컬럼 제외)을 뒤에 붙입니다.
+    설정하지 않은 숫자형 컬럼(예: '번호')은 과목으로 취급하지 않습니다.
+
+    Returns:
+        list: 과목 컬럼명 목록.
+    """
+    found = [subject for subject in subjects if subject in df.columns]
+    if pattern is None:
+        return found
+    for column in df.columns:
+        if column in found or column in NON_SUBJECT_COLUMNS or str(column).endswith(('석차', '등급')):
+            continue
+        if not re.search(pattern, str(column)):
+            continue
+        dtype = df[column].dtype
+        if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+            found.append(column)
+    return found
+
+
+def clean_chunk(chunk):
+    """
+    읽어 들인 한 덩어리(chunk)의 결측치와 범위를 검사하고 스키마 자료형으로 변환합니다.
+
+    - 학생ID/학년/과목 점수가 비어 있거나, 점수가 0~100 범위를 벗어나거나,
+      학년이 AVAILABLE_GRADE_YEARS에 없는 행은 제외합니다. 과목은 detect_subjects로 찾은
+      설정된 과목만 검사하며, 그 밖의 컬럼 값 때문에 행을 제외하지는 않습니다.
+    - 출석률(%)이 범위를 벗어나면 결측치(NaN)로 바꿉니다.
+    - 점수는 반올림해 uint8, 학년은 int8로 변환합니다.
+
+    Returns:
+        tuple: (정리된 DataFrame, 제외된 행 수)
+    """
+    subjects = detect_subjects(chunk)
+    valid = chunk['학생ID'].notna() & chunk['학년'].isin(AVAILABLE_GRADE_YEARS)
+    for subject in subjects:
+        valid &= chunk[subject].between(*SCORE_RANGE)
+    dropped = int((~valid).sum())
+    if dropped:
+        chunk = chunk[valid]
+
+    columns = {}
+    for column in chunk.columns:
+        values = chunk[column]
+        if column in subjects:
+            values = values.round().astype(SCORE_DTYPE)
+        elif column == '학년':
+            values = values.astype(YEAR_DTYPE)
+        elif column == '출석률(%)':
+            values = values.where(values.between(*ATTENDANCE_RANGE))
+        columns[column] = values
+    return pd.DataFrame(columns, index=chunk.index), dropped
+
+
+def iter_data_chunks(file_path, chunksize=LOAD_CHUNKSIZE, stats=None):
+    """
+    CSV 파일을 chunksize 행씩 스트리밍으로 읽어, 정리된 typed 덩어리를 하나씩 반환합니다.
+
+    Args:
+        file_path (str): 읽을 CSV 파일 경로.
+        chunksize (int): 한 번에 읽을 행 수.
+        stats (dict, optional): 전달하면 '행수', '제외행수'를 누적해 기록합니다.
+
+    Yields:
+        pd.DataFrame: 스키마 자료형으로 변환된 덩어리.
+    """
+    reader = pd.read_csv(file_path, dtype=CSV_DTYPES, chunksize=chunksize)
+    with reader:
+        for chunk in reader:
+            chunk, dropped = clean_chunk(chunk)
+            if stats is not None:
+                stats['행수'] = stats.get('행수', 0) + len(chunk)
+                stats['제외행수'] = stats.get('제외행수', 0) + dropped
+            yield chunk
+
+
+def _concat_chunks(chunks):
+    # 덩어리마다 범주(category)가 다를 수 있으므로 합집합으로 맞춘 뒤 이어 붙임
+    if not chunks:
+        empty = pd.DataFrame({column: pd.Series(dtype=dtype) for column, dtype in CSV_DTYPES.items()})
+        return clean_chunk(empty)[0]
+    for column in chunks[0].columns:
+        if isinstance(chunks[0][column].dtype, pd.CategoricalDtype):
+            categories = sorted(set().union(*(chunk[column].cat.categories for chunk in chunks)))
+            for chunk in chunks:
+                chunk[column] = chunk[column].cat.set_categories(categories)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def cache_path(file_path):
+    """CSV 파일에 대응하는 컬럼형 캐시 파일 경로를 반환합니다."""
+    return str(file_path) + CACHE_SUFFIX
+
+
+def _cleaning_fingerprint():
+    # 캐시된 DataFrame의 내용을 결정하는 스키마/검사 설정 (과목, 학년, 점수 범위, 자료형)
+    settings = [CSV_DTYPES, SCORE_DTYPE, YEAR_DTYPE, SCORE_RANGE, ATTENDANCE_RANGE, NON_SUBJECT_COLUMNS,
+                AVAILABLE_GRADE_YEARS, DEFAULT_SUBJECTS, SUBJECT_COLUMN_PATTERN]
+    return hashlib.sha256(json.dumps(settings, ensure_ascii=False).encode()).hexdigest()[:16]
+
+
+def _source_signature(file_path):
+    # 원본 CSV의 크기/수정 시각이나 정리 방식 설정이 바뀌면 캐시를 무효화
+    stat = os.stat(file_path)
+    return f"{CACHE_VERSION}:{_cleaning_fingerprint()}:{stat.st_size}:{stat.st_mtime_ns}".encode()
+
+
+def read_cache(file_path):
+    """
+    원본 CSV에 대한 캐시가 유효하면 메모리 매핑으로 읽어 반환합니다.
+
+    Returns:
+        pd.DataFrame | None: 캐시가 없거나, 원본이 바뀌었거나, pyarrow가 없으면 None.
+    """
+    path = cache_path(file_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return None
+    try:
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            metadata = reader.schema.metadata or {}
+            if metadata.get(_CACHE_META_KEY) != _source_signature(file_path):
+                return None
+            return reader.read_all().to_pandas()
+    except (OSError, pa.ArrowInvalid):
+        return None
+
+
+def write_cache(df, file_path, signature=None):
+    """
+    typed DataFrame을 원본 CSV 옆에 압축하지 않은 Feather 파일로 저장합니다.
+    (pyarrow가 없거나 쓰기 권한이 없으면 조용히 건너뜁니다.)
+
+    signature에는 CSV를 읽기 시작하기 전에 구한 _source_signature 값을 넘깁니다.
+    읽는 도중 CSV가 바뀌면 캐시에 이전 서명이 기록되므로 다음 실행에서 무효화됩니다.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.feather as feather
+    except ImportError:
+        return
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_CACHE_META_KEY] = signature or _source_signature(file_path)
+    table = table.replace_schema_metadata(metadata)
+    path = cache_path(file_path)
+    try:
+        # 다른 프로세스가 반쯤 쓰인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        feather.write_feather(table, path + '.tmp', compression='uncompressed')
+        os.replace(path + '.tmp', path)
+    except OSError:
+        pass
+
+
+@profiled('load_data', rows='output')
+def load_data(file_path, typed=False, chunksize=LOAD_CHUNKSIZE, report=False, use_cache=LOAD_CACHE):
+    """
+    학생 성적 CSV 파일을 불러옵니다.
+
+    Args:
+        file_path (str): 읽을 CSV 파일 경로.
+        typed (bool): True이면 스키마(범주형 반/성별, uint8 점수, float32 출석률,
+                      int8 학년)를 적용해 chunksize 행씩 스트리밍으로 읽고,
+                      덩어리마다 결측치/범위 검사를 수행합니다.
+        chunksize (int): typed 모드에서 한 번에 읽을 행 수.
+        report (bool): typed 모드에서 읽은 행 수, 제외된 행 수, 최대 메모리 사용량을 출력합니다.
+        use_cache (bool): typed 모드에서 CSV 옆의 컬럼형 캐시를 사용합니다.
+                          처음 읽을 때 캐시를 만들고, 이후에는 CSV를 다시 파싱하지 않고
+                          캐시를 메모리 매핑으로 읽습니다. CSV의 크기나 수정 시각,
+                          과목/학년/점수 범위 등 정리 방식 설정이 바뀌면 캐시를 다시 만듭니다.
+
+    Returns:
+        pd.DataFrame: 학생 성적 데이터.
+    """
+    if not typed:
+        df = pd.read_csv(file_path)
+        # 데이터 전처리 (결측치 처리, 자료형 변환 등)
+        return df
+
+    if use_cache:
+        df = read_cache(file_path)
+        if df is not None:
+            if report:
+                print(f"{file_path}: 캐시({cache_path(file_path)})에서 {len(df)}행 로드")
+            return df
 
-def load_data(file_path):
-    df = pd.read_csv(file_path)
-    # 데이터 전처리 (결측치 처리, 자료형 변환 등)
-    return df
\ No newline at end of file
+    # 파싱 중 CSV가 바뀌어도 캐시가 유효하다고 판단되지 않도록 읽기 전에 서명을 구함
+    signature = _source_signature(file_path) if use_cache else None
+    tracing = report and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    stats = {}
+    try:
+        df = _concat_chunks(list(iter_data_chunks(file_path, chunksize, stats)))
+        if report:
+            peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        if tracing:
+            tracemalloc.stop()
+    if report:
+        print(f"{file_path}: {stats.get('행수', 0)}행 로드, {stats.get('제외행수', 0)}행 제외, "
+              f"최대 메모리 {peak / 1024 ** 2:.1f}MB, 결과 크기 {df.memory_usage(deep=True).sum() / 1024 ** 2:.1f}MB")
+    if use_cache:
+        write_cache(df, file_path, signature)
+    return df
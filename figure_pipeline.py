@@ -0,0 +1,147 @@
+# 보고서 그래프를 여러 프로세스에서 PNG로 그리고, 입력 집계값이 같으면 이전 PNG를 재사용하는 기능 정의
+import hashlib
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from config import FIGURE_BOX_MAX_OUTLIERS, FIGURE_CACHE_DIR, FIGURE_DENSITY_BINS, FIGURE_WORKERS
+from profiling import stage
+
+# 그리기 코드(figures.py)가 바뀌면 캐시된 PNG를 다시 그리도록 키에 포함
+_FIGURES_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'figures.py')
+
+
+def density_grid(x, y, bins=FIGURE_DENSITY_BINS):
+    """
+    산점도 대신 그릴 2차원 밀도(개수) 격자를 계산합니다. 결측치가 있는 점은 제외합니다.
+
+    Returns:
+        tuple: (개수 배열 (bins × bins), x 구간 경계, y 구간 경계)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    valid = ~(np.isnan(x) | np.isnan(y))
+    return np.histogram2d(x[valid], y[valid], bins=bins)
+
+
+def box_stats(df, by, column, max_outliers=FIGURE_BOX_MAX_OUTLIERS):
+    """
+    그룹별 박스플롯 요약값(matplotlib Axes.bxp 형식)을 계산합니다. 결측치는 제외합니다.
+
+    사분위수는 np.percentile(linear), 수염은 1.5 × IQR 안의 가장 바깥 값으로 seaborn/matplotlib
+    박스플롯과 같은 방식이며, 이상치가 max_outliers개를 넘으면 크기순으로 고르게 골라 담습니다.
+
+    Returns:
+        list: 그룹 순서대로 'label', 'q1', 'med', 'q3', 'whislo', 'whishi', 'fliers' 키를 가진 dict 목록.
+    """
+    stats = []
+    for label, values in df.groupby(by, observed=True)[column]:
+        values = np.sort(values.dropna().to_numpy(dtype=np.float64))
+        if len(values) == 0:
+            continue
+        q1, med, q3 = np.percentile(values, [25, 50, 75])
+        low, high = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+        inside = values[(values >= low) & (values <= high)]
+        fliers = values[(values < low) | (values > high)]
+        if len(fliers) > max_outliers:
+            fliers = fliers[np.linspace(0, len(fliers) - 1, max_outliers).round().astype(np.int64)]
+        stats.append({
+            'label': label.item() if hasattr(label, 'item') else label,
+            'q1': q1, 'med': med, 'q3': q3,
+            'whislo': inside.min() if len(inside) else q1,
+            'whishi': inside.max() if len(inside) else q3,
+            'fliers': fliers,
+        })
+    return stats
+
+
+def _update_digest(digest, value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        labels = value.columns if isinstance(value, pd.DataFrame) else [value.name]
+        digest.update(repr((list(labels), list(value.index.names), str(value.dtypes))).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(repr((value.dtype.str, value.shape)).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        digest.update(f'seq{len(value)}'.encode())
+        for item in value:
+            _update_digest(digest, item)
+    elif isinstance(value, dict):
+        digest.update(f'map{len(value)}'.encode())
+        for key in sorted(value, key=repr):
+            _update_digest(digest, key)
+            _update_digest(digest, value[key])
+    else:
+        digest.update(repr(value).encode())
+
+
+def figure_key(plot_name, args):
+    """그리기 함수 이름, 입력 집계값, figures.py 내용으로 그래프 캐시 키(sha256)를 만듭니다."""
+    digest = hashlib.sha256(plot_name.encode())
+    with open(_FIGURES_SOURCE, 'rb') as f:
+        digest.update(f.read())
+    _update_digest(digest, args)
+    return digest.hexdigest()
+
+
+def _render(plot_name, args, path):
+    # 작업 프로세스에서 그래프 하나를 그려 path에 저장 (다른 프로세스가 반쯤 쓰인 파일을 읽지 않도록 교체 저장)
+    import figures
+    figures.use_headless_backend()
+    tmp_path = f'{path}.{os.getpid()}.tmp.png'
+    figures.save_figure(getattr(figures, plot_name)(*args), tmp_path)
+    os.replace(tmp_path, path)
+
+
+def render_figures(specs, out_dir, workers=FIGURE_WORKERS, cache_dir=FIGURE_CACHE_DIR):
+    """
+    그래프 목록을 out_dir에 '{이름}.png'로 저장합니다.
+
+    입력 집계값이 이전 실행과 같은 그래프는 cache_dir의 PNG를 복사하고, 나머지만
+    workers개의 프로세스에서 나눠 그립니다.
+
+    Args:
+        specs (list): (파일 이름, figures 모듈의 그리기 함수 이름, 인자 튜플) 목록.
+        out_dir (str): PNG를 저장할 디렉터리.
+        workers (int, optional): 작업 프로세스 수. None이면 CPU 코어 수, 1이면 현재 프로세스에서 그립니다.
+        cache_dir (str, optional): 그래프 캐시 디렉터리. None이면 캐시를 사용하지 않습니다.
+
+    Returns:
+        list: 저장한 PNG 경로 목록 (specs 순서).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+    targets, pending = [], []
+    for name, plot_name, args in specs:
+        path = os.path.join(out_dir, f'{name}.png')
+        if cache_dir is None:
+            pending.append((name, plot_name, args, path))
+            targets.append((path, None))
+            continue
+        cached = os.path.join(cache_dir, f'{figure_key(plot_name, args)}.png')
+        if not os.path.exists(cached):
+            pending.append((name, plot_name, args, cached))
+        targets.append((path, cached))
+
+    workers = min(workers or os.cpu_count() or 1, len(pending))
+    if workers <= 1:
+        for name, plot_name, args, path in pending:
+            with stage(f'figure.{name}'):
+                _render(plot_name, args, path)
+    else:
+        # 작업 프로세스가 그래프 라이브러리를 다시 불러오지 않도록 미리 불러온 뒤 프로세스 생성
+        import figures
+        figures.use_headless_backend()
+        with stage('figure.parallel', rows=len(pending)), ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_render, plot_name, args, path) for _, plot_name, args, path in pending]
+            for future in futures:
+                future.result()
+
+    for path, cached in targets:
+        if cached is not None:
+            shutil.copyfile(cached, path)
+    return [path for path, _ in targets]
@@ -0,0 +1,104 @@
+# 분석 결과 시각화 함수 모음 (대화형 화면 출력 / 배치 모드 파일 저장 공용)
+import os
+import sys
+
+import matplotlib
+
+# 화면(DISPLAY)이 없는 환경(서버, CI 등)에서는 창을 띄우지 않는 Agg 백엔드로 그림
+HEADLESS = sys.platform.startswith('linux') and not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+if HEADLESS:
+    matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt
+import numpy as np
+import seaborn as sns
+
+plt.rcParams['font.family'] = ['Malgun Gothic', 'NanumGothic', 'DejaVu Sans']
+plt.rcParams['axes.unicode_minus'] = False
+
+def plot_year_means(year_avg):
+    """학년별 과목 평균 막대그래프를 그리고 Figure를 반환합니다."""
+    ax = year_avg.plot(kind='bar', figsize=(10, 6))
+    ax.set_title('학년별 과목 평균')
+    ax.set_xlabel('학년')
+    ax.set_ylabel('평균 점수')
+    ax.tick_params(axis='x', rotation=0)
+    ax.legend()
+    ax.figure.tight_layout()
+    return ax.figure
+
+def plot_corr_heatmap(corr):
+    """과목 간 상관 행렬 heatmap을 그리고 Figure를 반환합니다."""
+    fig, ax = plt.subplots(figsize=(8, 6))
+    sns.heatmap(corr, annot=True, cmap='coolwarm', center=0, ax=ax)
+    ax.set_title('과목 간 상관 행렬')
+    return fig
+
+def plot_gender_means(gender_avg):
+    """성별별 과목 평균 막대그래프를 그리고 Figure를 반환합니다."""
+    ax = gender_avg.plot(kind='bar', figsize=(10, 6))
+    ax.set_title('성별별 과목 평균')
+    ax.set_xlabel('성별')
+    ax.set_ylabel('평균 점수')
+    ax.tick_params(axis='x', rotation=0)
+    ax.legend()
+    ax.figure.tight_layout()
+    return ax.figure
+
+def plot_attendance_boxplot(stats):
+    """
+    학년별 출석률 분포 박스플롯을 그리고 Figure를 반환합니다.
+    (figure_pipeline.box_stats로 미리 계산한 학년별 사분위수/수염/이상치 사용)
+    """
+    fig, ax = plt.subplots(figsize=(8, 6))
+    boxes = ax.bxp(stats, patch_artist=True, widths=0.8,
+                   medianprops={'color': '0.26'}, flierprops={'marker': 'd', 'markersize': 4})
+    for patch, color in zip(boxes['boxes'], sns.color_palette(n_colors=len(stats))):
+        patch.set_facecolor(color)
+    ax.set_xlabel('학년')
+    ax.set_ylabel('출석률 (%)')
+    ax.set_title('학년별 출석률 분포')
+    return fig
+
+def plot_regression(attendance, totals, slope, intercept):
+    """출석률 vs 총점 산점도와 회귀선을 그리고 Figure를 반환합니다."""
+    fig, ax = plt.subplots(figsize=(8, 6))
+    ax.scatter(attendance, totals, alpha=0.6)
+    ax.plot(attendance, slope * attendance + intercept, color='red', linewidth=2)
+    ax.set_xlabel('출석률 (%)')
+    ax.set_ylabel('총점')
+    ax.set_title('출석률 vs 총점 (회귀선 포함)')
+    ax.grid(True, alpha=0.3)
+    return fig
+
+def plot_regression_density(counts, x_edges, y_edges, slope, intercept):
+    """
+    점이 많을 때 산점도 대신 출석률 vs 총점 2차원 밀도(hexbin과 같은 격자 개수)와 회귀선을
+    그리고 Figure를 반환합니다. (figure_pipeline.density_grid 결과 사용)
+    """
+    fig, ax = plt.subplots(figsize=(8, 6))
+    mesh = ax.pcolormesh(x_edges, y_edges, np.ma.masked_equal(counts.T, 0), cmap='Blues')
+    fig.colorbar(mesh, ax=ax, label='학생 수')
+    ax.plot(x_edges[[0, -1]], slope * x_edges[[0, -1]] + intercept, color='red', linewidth=2)
+    ax.set_xlabel('출석률 (%)')
+    ax.set_ylabel('총점')
+    ax.set_title('출석률 vs 총점 (밀도, 회귀선 포함)')
+    ax.grid(True, alpha=0.3)
+    return fig
+
+def use_headless_backend():
+    """파일로만 저장할 때(배치 모드) 화면 유무와 관계없이 Agg 백엔드를 사용합니다."""
+    plt.switch_backend('Agg')
+
+def show_figure(fig):
+    """Figure를 화면에 표시합니다. 화면이 없으면 안내만 출력하고 Figure를 닫습니다."""
+    if HEADLESS:
+        print("화면(DISPLAY)이 없어 그래프를 표시할 수 없습니다. 배치 모드(--batch)로 PNG 파일을 저장하세요.")
+        plt.close(fig)
+        return
+    plt.show()
+
+def save_figure(fig, path):
+    """Figure를 PNG 파일로 저장하고 메모리에서 해제합니다."""
+    fig.savefig(path, dpi=100)
+    plt.close(fig)
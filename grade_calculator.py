@@ -1,95 +1,283 @@
 # grade_calculator.py 파일 내용 예시
+import functools
+
+import numpy as np
 import pandas as pd
+from config import GRADE_POLICIES, GRADE_SYSTEM
+from data_loader import detect_subjects
+from profiling import profiled
+
+class GradingPolicy:
+    """
+    config.GRADE_POLICIES 항목 하나를 미리 계산해 둔 등급 규칙.
+
+    - relative(비율제): 누적 비율표를 갖고 있다가 인원 수 n이 정해지면 누적 등급 경계
+      (grade_cutoffs)를 만들고, 정렬 위치에 np.searchsorted를 적용해 등급을 매깁니다.
+    - absolute(절대평가): 점수 하한표에 np.searchsorted를 적용해 점수만으로 등급을 매깁니다.
+    """
+
+    def __init__(self, name, type, ratios=None, thresholds=None, ties='order'):
+        if type not in ('relative', 'absolute'):
+            raise ValueError(f"알 수 없는 등급제 종류입니다: {type}")
+        if ties not in ('order', 'min'):
+            raise ValueError("ties는 'order' 또는 'min'만 사용할 수 있습니다.")
+        self.name = name
+        self.kind = type
+        self.ties = ties
+        if type == 'relative':
+            self.ratios = list(ratios)
+            self.levels = len(self.ratios)
+        else:
+            # 오름차순 점수 하한 (예: [60, 70, 80, 90])
+            self.thresholds = np.sort(np.asarray(thresholds, dtype=np.float64))
+            self.levels = len(self.thresholds) + 1
+
+    @property
+    def description(self):
+        """등급 산출 방식 안내 문구 (예: '5등급 상대평가(상위 10%, 24%, 32%, 24%, 10%) 비율제')."""
+        if self.kind == 'absolute':
+            bounds = ', '.join(f'{bound:g}' for bound in self.thresholds[::-1])
+            return f"{self.levels}등급 절대평가({bounds}점 이상)"
+        ratios = ', '.join(f'{ratio:.0%}' for ratio in self.ratios)
+        suffix = ', 동점자 동일 등급' if self.ties == 'min' else ''
+        return f"{self.levels}등급 상대평가(상위 {ratios}{suffix}) 비율제"
+
+    def cutoffs(self, n):
+        """비율제에서 n명일 때의 누적 등급 경계."""
+        return grade_cutoffs(n, self.ratios)
+
+    def absolute_grades(self, scores, scale=1):
+        """절대평가 등급. scale은 점수 하한에 곱할 값입니다 (예: 세 과목 총점이면 3)."""
+        bounds = self.thresholds * scale
+        # 결측 점수는 가장 낮은 등급
+        scores = np.nan_to_num(np.asarray(scores, dtype=np.float64), nan=-np.inf)
+        return (self.levels - np.searchsorted(bounds, scores, side='right')).astype(np.int8)
+
+    def grade(self, scores, groups=None, scale=1):
+        """
+        점수 배열 전체에 등급을 한 번에 부여합니다.
+
+        Args:
+            scores (array-like): (N,) 또는 (N, 컬럼 수) 모양의 점수 배열.
+            groups (array-like, optional): 비율제에서 그룹(예: 학년)마다 따로 등급을 매길 때의 그룹 값.
+            scale (float | array-like): 절대평가에서 컬럼별로 점수 하한에 곱할 값.
+
+        Returns:
+            np.ndarray: scores와 같은 모양의 등급 배열 (1등급부터 시작).
+        """
+        if self.kind == 'relative':
+            return ratio_grades(scores, self.ratios, groups, self.ties)
+        scores = np.asarray(scores, dtype=np.float64)
+        if scores.ndim == 1:
+            return self.absolute_grades(scores, scale)
+        scales = np.broadcast_to(scale, scores.shape[1:])
+        return np.column_stack([self.absolute_grades(scores[:, j], scales[j]) for j in range(scores.shape[1])])
+
+
+@functools.lru_cache(maxsize=None)
+def get_policy(name=GRADE_SYSTEM):
+    """
+    config.GRADE_POLICIES에 정의된 등급제를 이름으로 찾아 GradingPolicy로 만듭니다. (이름별로 한 번만 생성)
+    """
+    if isinstance(name, GradingPolicy):
+        return name
+    if name not in GRADE_POLICIES:
+        raise ValueError(f"config.GRADE_POLICIES에 없는 등급제입니다: {name}")
+    return GradingPolicy(name, **GRADE_POLICIES[name])
+
 
 def calculate_grade(total_score):
-    """총점에 따라 학점을 계산합니다."""
-    if total_score >= 90:
-        return 1
-    elif total_score >= 80:
-        return 2
-    elif total_score >= 70:
-        return 3
-    elif total_score >= 60:
-        return 4
+    """
+    점수에 따라 절대평가 등급을 계산합니다 (config.GRADE_POLICIES['절대평가'], 기본 90/80/70/60점 이상).
+    점수 하나를 넘기면 정수를, 배열/Series를 넘기면 같은 모양의 등급 배열을 반환합니다.
+    """
+    grades = get_policy('절대평가').absolute_grades(np.asarray(total_score, dtype=np.float64))
+    return int(grades) if grades.ndim == 0 else grades
+
+# 기본 5등급 상대평가 비율 (config.GRADE_POLICIES['5등급'])
+GRADE_RATIOS = GRADE_POLICIES['5등급']['ratios']
+
+def grade_cutoffs(n, ratios=GRADE_RATIOS):
+    """
+    n명을 비율대로 나눌 때의 누적 등급 경계를 계산합니다.
+
+    각 등급 인원은 int(n * 비율)이며, 나누고 남는 인원은 마지막 등급에 포함됩니다.
+
+    Args:
+        n (int): 전체 인원 수.
+        ratios (list): 등급별 비율.
+
+    Returns:
+        np.ndarray: 등급별 누적 인원 (예: n=120 → [12, 40, 78, 106, 118]).
+    """
+    return np.cumsum([int(n * p) for p in ratios])
+
+def _group_layout(scores, groups):
+    # (정렬 키 2차원 배열, 그룹 코드, 그룹별 인원, 정렬 순서상 그룹 시작 위치)
+    keys = -np.asarray(scores, dtype=np.float64)
+    n = keys.shape[0]
+    if groups is None:
+        codes = np.zeros(n, dtype=np.intp)
+    else:
+        codes = np.unique(np.asarray(groups), return_inverse=True)[1].reshape(n)
+    sizes = np.bincount(codes)
+    starts = np.cumsum(sizes) - sizes
+    return keys.reshape(n, int(np.prod(keys.shape[1:]))), codes, sizes, starts
+
+def _sorted_runs(keys, codes):
+    """
+    그룹 → 점수 내림차순으로 안정 정렬(lexsort)한 순서와, 정렬된 각 위치가 속한
+    동점 구간(같은 그룹·같은 점수)의 첫 위치를 반환합니다.
+    """
+    order = np.lexsort((keys, codes))
+    n = len(order)
+    if n == 0:
+        return order, order
+    sorted_keys, sorted_codes = keys[order], codes[order]
+    run_start = np.r_[True, (sorted_keys[1:] != sorted_keys[:-1]) | (sorted_codes[1:] != sorted_codes[:-1])]
+    return order, np.maximum.accumulate(np.where(run_start, np.arange(n), 0))
+
+def _ratio_cutoffs(sizes, starts, ratios):
+    # 그룹별 누적 등급 경계를 정렬된 전체 위치 기준으로 이어 붙임
+    cut_counts = (sizes[:, None] * np.asarray(ratios)).astype(np.int64)
+    cutoffs = (starts[:, None] + np.cumsum(cut_counts, axis=1)).ravel()
+    return cutoffs, np.arange(len(sizes)) * len(ratios)
+
+def ratio_grades(scores, ratios=GRADE_RATIOS, groups=None, ties='order'):
+    """
+    점수 배열에 비율제 등급을 부여합니다.
+
+    점수 내림차순(동점은 원래 순서 유지) 위치를 구한 뒤, 누적 등급 경계에
+    np.searchsorted를 적용해 한 번에 등급을 계산합니다.
+    2차원 배열을 넘기면 각 열(과목)을 독립적으로 한 번에 처리합니다.
+
+    Args:
+        scores (array-like): (N,) 또는 (N, 과목 수) 모양의 점수 배열.
+        ratios (list): 등급별 비율.
+        groups (array-like, optional): (N,) 모양의 그룹 값(예: 학년).
+                                       지정하면 그룹마다 따로 등급을 매깁니다.
+        ties (str): 'order'이면 동점자도 정렬 위치(원래 순서)대로 등급을 나누고,
+                    'min'이면 동점자 모두 가장 앞선 위치(석차 method='min')의 등급을 받습니다.
+
+    Returns:
+        np.ndarray: scores와 같은 모양의 등급 배열 (1등급부터 시작).
+    """
+    shape = np.shape(scores)
+    columns, codes, sizes, starts = _group_layout(scores, groups)
+    cutoffs, offsets = _ratio_cutoffs(sizes, starts, ratios)
+    grades = np.empty(columns.shape, dtype=np.int8)
+    for j in range(columns.shape[1]):
+        order, first = _sorted_runs(columns[:, j], codes)
+        positions = np.empty(len(order), dtype=np.intp)
+        positions[order] = first if ties == 'min' else np.arange(len(order))
+        grade = np.searchsorted(cutoffs, positions, side='right') - offsets[codes] + 1
+        grades[:, j] = np.minimum(grade, len(ratios))
+    return grades.reshape(shape)
+
+def grade_scores(scores, policy=GRADE_SYSTEM, groups=None, scale=1):
+    """
+    등급제(policy)에 따라 점수 배열에 등급을 부여합니다. (GradingPolicy.grade 참고)
+
+    Args:
+        policy (str | GradingPolicy): config.GRADE_POLICIES의 등급제 이름 또는 GradingPolicy.
+    """
+    return get_policy(policy).grade(scores, groups, scale)
+
+def rank_and_grade_scores(scores, policy=GRADE_SYSTEM, groups=None, scale=1):
+    """
+    (N, 컬럼 수) 점수 행렬의 그룹 안 석차(method='min')와 등급을 한 번에 계산합니다.
+
+    컬럼마다 정렬을 한 번만 하고, 같은 정렬 결과로 석차와 비율제 등급을 함께 구합니다.
+    (절대평가 등급제는 등급을 점수만으로 계산합니다.)
+
+    Args:
+        scores (array-like): (N,) 또는 (N, 컬럼 수) 모양의 점수 배열.
+        policy (str | GradingPolicy): config.GRADE_POLICIES의 등급제 이름 또는 GradingPolicy.
+        groups (array-like, optional): (N,) 모양의 그룹 값(예: 학년).
+        scale (float | array-like): 절대평가에서 컬럼별로 점수 하한에 곱할 값.
+
+    Returns:
+        tuple: (석차 배열, 등급 배열). 둘 다 scores와 같은 모양입니다.
+    """
+    policy = get_policy(policy)
+    shape = np.shape(scores)
+    columns, codes, sizes, starts = _group_layout(scores, groups)
+    relative = policy.kind == 'relative'
+    if relative:
+        cutoffs, offsets = _ratio_cutoffs(sizes, starts, policy.ratios)
+        grades = np.empty(columns.shape, dtype=np.int8)
     else:
-        return 5
+        grades = policy.grade(scores, scale=scale)
+    ranks = np.empty(columns.shape, dtype=np.int64)
+    for j in range(columns.shape[1]):
+        order, first = _sorted_runs(columns[:, j], codes)
+        ranks[order, j] = first - starts[codes[order]] + 1
+        if relative:
+            positions = np.empty(len(order), dtype=np.intp)
+            positions[order] = first if policy.ties == 'min' else np.arange(len(order))
+            grade = np.searchsorted(cutoffs, positions, side='right') - offsets[codes] + 1
+            grades[:, j] = np.minimum(grade, policy.levels)
+    return ranks.reshape(shape), grades.reshape(shape)
+
+@profiled('grade_columns')
+def grade_columns(df, columns=None, include_total=True, policy=GRADE_SYSTEM):
+    """
+    여러 과목(및 총점)의 등급을 한 번에 계산합니다. 입력 DataFrame은 복사하지 않습니다.
+
+    Args:
+        df (pd.DataFrame): 학생 성적 데이터가 담긴 DataFrame.
+        columns (list, optional): 등급을 계산할 점수 컬럼 목록. 지정하지 않으면 스키마에서 찾은 과목 전체.
+        include_total (bool): True이면 columns 점수의 합(총점) 등급도 함께 계산합니다.
+        policy (str): config.GRADE_POLICIES의 등급제 이름.
 
-def assign_grades(df):
+    Returns:
+        pd.DataFrame: df와 같은 인덱스를 가지며, 컬럼별 등급이 담긴 DataFrame.
+                      include_total이 True이면 '총점' 컬럼이 추가됩니다.
+    """
+    columns = list(detect_subjects(df) if columns is None else columns)
+    scores = df[columns].to_numpy(dtype=np.float64)
+    scale = [1] * len(columns)
+    if include_total:
+        scores = np.column_stack([scores, scores.sum(axis=1)])
+        scale.append(len(columns))
+        columns = columns + ['총점']
+    return pd.DataFrame(grade_scores(scores, policy, scale=scale), index=df.index, columns=columns)
+
+@profiled('assign_grades', declared_copies=1)
+def assign_grades(df, subjects=None, policy=GRADE_SYSTEM):
     """
     학생별 총점과 평균을 계산하고, 등급을 부여합니다.
 
     Args:
         df (pd.DataFrame): 학생 성적 데이터가 담긴 DataFrame.
-                           '수학', '영어', '과학' 컬럼이 존재해야 합니다.
+        subjects (list, optional): 총점에 포함할 과목 목록. 지정하지 않으면 스키마에서 찾은 과목 전체.
+        policy (str): config.GRADE_POLICIES의 등급제 이름.
 
     Returns:
         pd.DataFrame: 총점(total_score), 평균(average_score), 등급(grade) 컬럼이 추가된 DataFrame.
     """
-    # DataFrame을 명시적으로 복사
-    df_copy = df.copy()
-    
-    df_copy['총점'] = df_copy[['수학', '영어', '과학']].sum(axis=1) # 각 학생 총점 계산
-    df_copy['평균'] = df_copy['총점'] / 3  # 각 학생 평균 계산
-
-    # 비율 기반 등급 산정
-    N = len(df_copy)
-    df_sorted = df_copy.sort_values(by='총점', ascending=False).reset_index(drop=True)
-    grade_boundaries = [0.10, 0.24, 0.32, 0.24, 0.10]
-    grade_counts = [int(N * p) for p in grade_boundaries]
-    
-    # 누적 등급 리스트 생성
-    grades = []
-    for i, count in enumerate(grade_counts, start=1):
-        grades += [i] * count
-    
-    # 등급 수가 부족하거나 넘칠 경우 처리
-    if len(grades) < N:
-        grades += [5] * (N - len(grades))
-    elif len(grades) > N:
-        grades = grades[:N]
-    
-    df_sorted['등급'] = grades
-
-    # 원래 인덱스 순서로 복원
-    df_copy['등급'] = df_sorted['등급'].values
-    return df_copy
-
-def assign_subject_grades(df, score_column):
+    subjects = list(detect_subjects(df) if subjects is None else subjects)
+    total = df[subjects].sum(axis=1) # 각 학생 총점 계산
+    return df.assign(
+        총점=total,
+        평균=total / len(subjects),  # 각 학생 평균 계산
+        등급=grade_scores(total.to_numpy(), policy, scale=len(subjects)),  # 등급제에 따른 등급 산정
+    )
+
+@profiled('assign_subject_grades', declared_copies=1)
+def assign_subject_grades(df, score_column, policy=GRADE_SYSTEM):
     """
     특정 과목에 대한 등급을 계산합니다.
 
     Args:
         df (pd.DataFrame): 학생 성적 데이터가 담긴 DataFrame.
-        score_column (str): 등급을 계산할 과목 컬럼명 (예: '수학', '영어', '과학')
+        score_column (str): 등급을 계산할 과목 컬럼명 (예: '수학', '국어')
+        policy (str): config.GRADE_POLICIES의 등급제 이름.
 
     Returns:
         pd.DataFrame: 등급(grade) 컬럼이 추가된 DataFrame.
     """
-    # DataFrame을 명시적으로 복사
-    df_copy = df.copy()
-    
-    # 비율 기반 등급 산정
-    N = len(df_copy)
-    df_sorted = df_copy.sort_values(by=score_column, ascending=False).reset_index(drop=True)
-    grade_boundaries = [0.10, 0.24, 0.32, 0.24, 0.10]
-    grade_counts = [int(N * p) for p in grade_boundaries]
-    
-    # 누적 등급 리스트 생성
-    grades = []
-    for i, count in enumerate(grade_counts, start=1):
-        grades += [i] * count
-    
-    # 등급 수가 부족하거나 넘칠 경우 처리
-    if len(grades) < N:
-        grades += [5] * (N - len(grades))
-    elif len(grades) > N:
-        grades = grades[:N]
-    
-    df_sorted['등급'] = grades
-
-    # 원래 인덱스 순서로 복원
-    df_copy['등급'] = df_sorted['등급'].values
-    return df_copy
+    return df.assign(등급=grade_scores(df[score_column].to_numpy(), policy))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,241 @@
+import numpy as np
+import pandas as pd
+from config import GRADE_SYSTEM
+from aggregation_cache import memoized
+from data_loader import detect_subjects
+from profiling import profiled
+from rank_and_grade import get_ranks_and_grades
+
+# 학생ID 해시(FNV-1a 64비트) 상수
+_FNV_OFFSET = 14695981039346656037
+_FNV_PRIME = 1099511628211
+_HASH_MASK = 2 ** 64 - 1
+
+
+def _hash_ids(ids):
+    """고정 길이 바이트 배열(S 자료형)의 각 학생ID를 FNV-1a로 해시합니다. (뒤쪽 빈 바이트 포함)"""
+    raw = ids.view(np.uint8).reshape(len(ids), ids.dtype.itemsize)
+    hashes = np.full(len(ids), _FNV_OFFSET, dtype=np.uint64)
+    for i in range(raw.shape[1]):
+        hashes = (hashes ^ raw[:, i]) * np.uint64(_FNV_PRIME)
+    return hashes
+
+
+def _hash_key(key, width):
+    """학생ID 하나(bytes)를 width 바이트로 채운 뒤 _hash_ids와 같은 방식으로 해시합니다."""
+    value = _FNV_OFFSET
+    for byte in key.ljust(width, b'\0'):
+        value = ((value ^ byte) * _FNV_PRIME) & _HASH_MASK
+    return value
+
+
+def _build_table(hashes, rows):
+    """
+    선형 탐사(open addressing) 해시 테이블을 만듭니다.
+
+    테이블 크기는 키 수의 2배 이상인 2의 거듭제곱이며, 각 칸에는 행 번호(비어 있으면 -1)가
+    들어 있습니다. 같은 칸을 노리는 키는 한 번에 하나씩만 자리를 잡고, 나머지는 다음 칸으로
+    넘어가는 과정을 모든 키가 자리를 잡을 때까지 반복합니다.
+    """
+    size = 1 << max((2 * len(rows)).bit_length(), 3)
+    mask = np.uint64(size - 1)
+    table = np.full(size, -1, dtype=np.int32 if len(hashes) < 2 ** 31 else np.int64)
+    pending = rows
+    probe = np.uint64(0)
+    while len(pending):
+        slots = ((hashes[pending] + probe) & mask).astype(np.int64)
+        free = table[slots] == -1
+        taken_slots, first = np.unique(slots[free], return_index=True)
+        winners = pending[free][first]
+        table[taken_slots] = winners
+        pending = pending[~np.isin(pending, winners)]
+        probe += np.uint64(1)
+    return table
+
+
+def _compact(values):
+    """정수 배열을 값 범위에 맞는 가장 작은 정수 자료형으로 바꿉니다. (정수가 아니면 그대로 반환)"""
+    values = np.asarray(values)
+    if values.dtype.kind not in 'iu' or len(values) == 0:
+        return values
+    return values.astype(np.result_type(np.min_scalar_type(values.min()), np.min_scalar_type(values.max())))
+
+
+def _codes(df, column):
+    """범주형 컬럼을 (작은 정수 코드 배열, 범주 목록)으로 바꿉니다. 컬럼이 없으면 (None, None)."""
+    if column not in df.columns:
+        return None, None
+    categorical = pd.Categorical(df[column])
+    return categorical.codes, [category.item() if hasattr(category, 'item') else category
+                               for category in categorical.categories]
+
+
+def _rank_store(year_codes, scores, ranks):
+    """
+    학년 안 석차(method='min')는 점수에만 달려 있으므로, 점수가 0 이상의 정수이면
+    (학년 코드, 점수) → 석차 표 하나로 줄여 저장합니다. 그 외에는 학생별 석차 배열을 저장합니다.
+    """
+    if scores.dtype.kind in 'iu' and len(scores) and scores.min() >= 0:
+        table = np.zeros((year_codes.max() + 1, int(scores.max()) + 1), dtype=_compact(ranks).dtype)
+        table[year_codes, scores] = ranks
+        return table
+    return _compact(ranks)
+
+
+class GradeIndex:
+    """
+    학년별 과목 석차/등급과 전체 석차/등급을 한 번만 계산해 두고
+    학생ID로 바로(O(1)) 조회할 수 있게 만든 인덱스.
+
+    데이터셋을 불러온 뒤 한 번 생성해 두면, 조회할 때마다 학년 전체를
+    다시 정렬하지 않아도 됩니다. 학생 정보는 DataFrame 대신 열 단위 NumPy 배열로
+    저장합니다. 학생ID는 고정 길이 바이트 배열과 해시 테이블로, 학년/반/성별은 작은 정수
+    코드로, 점수/등급은 값 범위에 맞는 가장 작은 정수 자료형으로, 석차는 (학년, 점수)별 표로
+    보관합니다. 총점/평균은 조회할 때 과목 점수로 계산합니다.
+    """
+
+    def __init__(self, ids, columns, subjects):
+        self.subjects = list(subjects)
+        self._ids = ids
+        self._columns = columns
+        self._table = _build_table(_hash_ids(ids), self._latest_rows(ids))
+
+    @staticmethod
+    def _latest_rows(ids):
+        # 같은 학생ID가 여러 번 나오면 마지막 행을 사용
+        _, last = np.unique(ids[::-1], return_index=True)
+        return np.sort(len(ids) - 1 - last)
+
+    @classmethod
+    def from_frame(cls, df, subjects=None, policy=GRADE_SYSTEM):
+        """
+        학생 성적 DataFrame으로부터 인덱스를 생성합니다.
+
+        Args:
+            df (pd.DataFrame): '학생ID', '학년'과 과목 점수 컬럼이 존재하는 DataFrame.
+            subjects (list, optional): 석차/등급을 계산할 과목 목록. 지정하지 않으면 스키마에서 찾은 과목 전체.
+                                       총점/전체 석차/전체 등급은 이 과목들의 합으로 계산합니다.
+            policy (str): config.GRADE_POLICIES의 등급제 이름.
+
+        Returns:
+            GradeIndex: 학생ID를 키로 하는 석차/등급 인덱스.
+        """
+        subjects = detect_subjects(df) if subjects is None else [subj for subj in subjects if subj in df.columns]
+        # 학년 × 과목 석차/등급을 한 번에 계산
+        table = get_ranks_and_grades(df, subjects=subjects, policy=policy)
+
+        ids = np.array([str(student_id).encode('utf-8') for student_id in table['학생ID'].tolist()], dtype='S')
+        year_codes, years = _codes(table, '학년')
+        class_codes, classes = _codes(df, '반')
+        gender_codes, genders = _codes(df, '성별')
+        scores = [_compact(df[subj].to_numpy()) for subj in subjects]
+        columns = {
+            '학년': year_codes, '학년목록': years,
+            '반': class_codes, '반목록': classes,
+            '성별': gender_codes, '성별목록': genders,
+            '점수': scores,
+            '석차': [_rank_store(year_codes, score, table[f'{subj}석차'].to_numpy())
+                   for score, subj in zip(scores, subjects)],
+            '과목등급': [table[f'{subj}등급'].to_numpy() for subj in subjects],
+        }
+        if subjects:
+            totals = _compact(table['총점'].to_numpy())
+            columns['전체석차'] = _rank_store(year_codes, totals, table['전체석차'].to_numpy())
+            columns['전체등급'] = table['전체등급'].to_numpy()
+        return cls(ids, columns, subjects)
+
+    def _find(self, student_id):
+        # 학생ID → 행 번호 (없으면 None)
+        key = str(student_id).encode('utf-8')
+        width = self._ids.dtype.itemsize
+        if len(key) > width or key.endswith(b'\0'):
+            return None
+        mask = len(self._table) - 1
+        slot = _hash_key(key, width) & mask
+        while True:
+            row = int(self._table[slot])
+            if row < 0:
+                return None
+            if self._ids[row] == key:
+                return row
+            slot = (slot + 1) & mask
+
+    def __contains__(self, student_id):
+        return self._find(student_id) is not None
+
+    def __len__(self):
+        return int((self._table >= 0).sum())
+
+    @property
+    def nbytes(self):
+        """인덱스가 사용하는 NumPy 배열의 총 바이트 수."""
+        arrays = [self._ids, self._table] + [
+            value for values in self._columns.values() if values is not None
+            for value in (values if isinstance(values, list) else [values]) if isinstance(value, np.ndarray)
+        ]
+        return sum(array.nbytes for array in arrays)
+
+    def _rank(self, store, row, score):
+        if store.ndim == 2:
+            return int(store[self._columns['학년'][row], score])
+        return int(store[row])
+
+    def _category(self, column, row):
+        codes = self._columns[column]
+        if codes is None or codes[row] < 0:
+            return None
+        return self._columns[f'{column}목록'][codes[row]]
+
+    def get(self, student_id, year=None):
+        """
+        학생의 석차/등급 레코드를 반환합니다.
+
+        Args:
+            student_id (str): 조회할 학생ID.
+            year (int, optional): 지정하면 해당 학년 학생인 경우에만 반환합니다.
+
+        Returns:
+            dict | None: 학생 레코드. 찾을 수 없으면 None.
+        """
+        row = self._find(student_id)
+        if row is None:
+            return None
+        columns = self._columns
+        student_year = self._category('학년', row)
+        if year is not None and student_year != year:
+            return None
+        scores = [score[row].item() for score in columns['점수']]
+        record = {
+            '학생ID': student_id,
+            '학년': student_year,
+            '반': self._category('반', row),
+            '성별': self._category('성별', row),
+            '점수': dict(zip(self.subjects, scores)),
+            '석차': {subj: self._rank(columns['석차'][i], row, scores[i]) for i, subj in enumerate(self.subjects)},
+            '과목등급': {subj: int(columns['과목등급'][i][row]) for i, subj in enumerate(self.subjects)},
+            '총점': None,
+            '평균': None,
+            '전체석차': None,
+            '전체등급': None,
+        }
+        if '전체등급' in columns:
+            record['총점'] = sum(scores)
+            record['평균'] = record['총점'] / len(self.subjects)
+            record['전체석차'] = self._rank(columns['전체석차'], row, record['총점'])
+            record['전체등급'] = int(columns['전체등급'][row])
+        return record
+
+
+def get_grade_index(df, subjects=None):
+    """
+    DataFrame별로 한 번만 GradeIndex를 생성하고, 이후에는 같은 인덱스를 재사용합니다.
+    subjects를 지정하지 않으면 detect_subjects 결과를 사용하며, 과목 목록을 직접 넘긴 호출과
+    같은 인덱스를 공유합니다.
+    """
+    subjects = detect_subjects(df) if subjects is None else [subj for subj in subjects if subj in df.columns]
+    return _cached_grade_index(df, subjects)
+
+@memoized('grade_index')
+@profiled('grade_index_build')
+def _cached_grade_index(df, subjects):
+    return GradeIndex.from_frame(df, subjects)
@@ -0,0 +1,240 @@
+# 학기별 명단과 미리 계산한 석차/등급을 학기 단위로 나눠 Parquet으로 쌓아 두고, 여러 학기에 걸친 추이를 조회하는 기능 정의
+import argparse
+import json
+import os
+import shutil
+
+import pandas as pd
+from config import GRADE_SYSTEM, HISTORY_ROW_GROUP_SIZE, HISTORY_STORE_DIR
+from data_loader import detect_subjects, load_data
+from profiling import profiled, stage
+from rank_and_grade import calculate_all_ranks_and_grades
+
+# 학기 파티션 컬럼 이름 (디렉터리 이름: '학기=2024-1')
+TERM_COLUMN = '학기'
+# 명단에서 점수 외에 함께 저장하는 컬럼
+ROSTER_COLUMNS = ('학생ID', '학년', '반', '성별', '출석률(%)')
+_META_KEY = b'gradescope_history'
+
+
+def _arrow():
+    # pyarrow는 저장소를 사용할 때만 불러옴
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("학기별 저장소를 사용하려면 pyarrow가 필요합니다 (pip install pyarrow).") from e
+    return pa, ds, pq
+
+
+def graded_roster(df, subjects=None, policy=GRADE_SYSTEM):
+    """
+    명단에 학년별 과목/총점 석차와 등급을 붙인 표를 만듭니다. (저장소에 학기 하나로 저장되는 내용)
+
+    Returns:
+        pd.DataFrame: '학생ID', '학년', '반', '성별', '출석률(%)', 과목 점수, '{과목}석차', '{과목}등급', ...,
+                      '총점', '평균', '전체석차', '전체등급' 컬럼 (명단에 없는 컬럼은 제외).
+    """
+    subjects = detect_subjects(df) if subjects is None else list(subjects)
+    ranks = calculate_all_ranks_and_grades(df, subjects=subjects, policy=policy)
+    roster = df[[column for column in ROSTER_COLUMNS if column in df.columns] + subjects]
+    return pd.concat([roster, ranks.drop(columns=[column for column in ranks.columns if column in roster.columns])],
+                     axis=1)
+
+
+class HistoryStore:
+    """
+    학기별 명단/석차/등급을 추가만 하는(append-only) 컬럼형 저장소.
+
+    학기마다 root/학기=<학기>/ 디렉터리에 Parquet 파일 하나를 저장합니다. 파일은 학생ID 순으로
+    정렬하고 작은 행 그룹으로 나눠 쓰므로, 조회할 때는 필요한 학기 디렉터리와 컬럼, 학생ID 범위의
+    행 그룹만 읽습니다. 석차/등급은 저장할 때 한 번만 계산하므로 학기를 비교할 때 다시 계산하지 않습니다.
+    """
+
+    def __init__(self, root=HISTORY_STORE_DIR):
+        self.root = root
+
+    def _term_dir(self, term):
+        return os.path.join(self.root, f'{TERM_COLUMN}={term}')
+
+    def terms(self):
+        """저장된 학기 목록 (이름순)."""
+        if not os.path.isdir(self.root):
+            return []
+        prefix = f'{TERM_COLUMN}='
+        return sorted(name[len(prefix):] for name in os.listdir(self.root) if name.startswith(prefix))
+
+    def __contains__(self, term):
+        return os.path.isdir(self._term_dir(term))
+
+    def append(self, df, term, subjects=None, policy=GRADE_SYSTEM):
+        """
+        학기 하나의 명단을 석차/등급과 함께 저장합니다. 이미 저장된 학기는 덮어쓰지 않습니다.
+
+        Args:
+            df (pd.DataFrame): '학생ID', '학년'과 과목 점수 컬럼이 존재하는 DataFrame.
+            term (str): 학기 이름 (예: '2024-1'). 이름순 정렬이 시간순이 되도록 짓습니다.
+            subjects (list, optional): 저장할 과목 목록. 지정하지 않으면 스키마에서 찾은 과목 전체.
+            policy (str): 석차/등급 계산에 사용할 config.GRADE_POLICIES의 등급제 이름.
+
+        Returns:
+            str: 저장한 Parquet 파일 경로.
+        """
+        pa, _, pq = _arrow()
+        term = str(term)
+        if not term or term.startswith(('.', '_')) or any(char in term for char in ('/', '\\', '=')):
+            raise ValueError(f"학기 이름에 사용할 수 없는 문자가 있습니다: {term!r}")
+        if term in self:
+            raise ValueError(f"이미 저장된 학기입니다: {term}")
+        subjects = detect_subjects(df) if subjects is None else list(subjects)
+
+        with stage('history.grade', rows=len(df)):
+            roster = graded_roster(df, subjects, policy).sort_values('학생ID', kind='stable')
+        table = pa.Table.from_pandas(roster, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[_META_KEY] = json.dumps({'subjects': subjects, 'policy': policy}, ensure_ascii=False).encode()
+        table = table.replace_schema_metadata(metadata)
+
+        # 다른 프로세스가 반쯤 쓰인 학기를 읽지 않도록 숨김 디렉터리에 쓴 뒤 이름을 바꿔 추가
+        os.makedirs(self.root, exist_ok=True)
+        staging = os.path.join(self.root, f'.{term}.{os.getpid()}.tmp')
+        os.makedirs(staging, exist_ok=True)
+        try:
+            with stage('history.write', rows=len(roster)):
+                pq.write_table(table, os.path.join(staging, 'part-0.parquet'), row_group_size=HISTORY_ROW_GROUP_SIZE)
+            os.rename(staging, self._term_dir(term))
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            if term in self:
+                raise ValueError(f"이미 저장된 학기입니다: {term}")
+            raise
+        return os.path.join(self._term_dir(term), 'part-0.parquet')
+
+    def append_csv(self, file_path, term, subjects=None, policy=GRADE_SYSTEM):
+        """CSV 파일을 typed 모드로 불러와 학기 하나로 저장합니다."""
+        return self.append(load_data(file_path, typed=True), term, subjects, policy)
+
+    def dataset(self, terms=None):
+        """
+        저장소(또는 지정한 학기들)를 pyarrow Dataset으로 엽니다.
+
+        학기마다 과목 구성이 달라도 컬럼을 합친 스키마를 사용하며, 없는 컬럼은 결측치로 읽습니다.
+        """
+        pa, ds, _ = _arrow()
+        terms = self.terms() if terms is None else [str(term) for term in terms if str(term) in self]
+        paths = [os.path.join(self._term_dir(term), 'part-0.parquet') for term in terms]
+        partitioning = ds.HivePartitioning(pa.schema([(TERM_COLUMN, pa.string())]), segment_encoding='none')
+        dataset = ds.dataset(paths, format='parquet', partitioning=partitioning, partition_base_dir=self.root)
+        schemas = [fragment.physical_schema for fragment in dataset.get_fragments()]
+        if not schemas:
+            return dataset
+        schema = pa.unify_schemas([schema.remove_metadata() for schema in schemas])
+        schema = schema.append(pa.field(TERM_COLUMN, pa.string()))
+        return ds.dataset(paths, schema=schema, format='parquet', partitioning=partitioning,
+                          partition_base_dir=self.root)
+
+    def subjects(self, terms=None):
+        """저장된 학기들의 과목 목록 (처음 나온 순서)."""
+        subjects = []
+        for fragment in self.dataset(terms).get_fragments():
+            info = json.loads(fragment.physical_schema.metadata[_META_KEY])
+            subjects += [subject for subject in info['subjects'] if subject not in subjects]
+        return subjects
+
+    def read(self, columns, terms=None, filter=None):
+        """필요한 컬럼/학기/조건의 행만 읽어 DataFrame으로 반환합니다."""
+        dataset = self.dataset(terms)
+        if not dataset.files:
+            return pd.DataFrame(columns=columns)  # 저장된 학기가 없는 경우
+        columns = [column for column in columns if column in dataset.schema.names]
+        return dataset.to_table(columns=columns, filter=filter).to_pandas()
+
+    @profiled('history_trajectory', rows='output')
+    def trajectory(self, student_id, subject='전체', terms=None):
+        """
+        학생 한 명의 학기별 석차/등급 변화를 조회합니다.
+
+        Args:
+            student_id (str): 조회할 학생ID.
+            subject (str): 과목명 또는 '전체'(총점 기준).
+            terms (list, optional): 조회할 학기 목록. 지정하지 않으면 전체 학기.
+
+        Returns:
+            pd.DataFrame: 학기 순서대로 '학기', '학년', '반', (과목 점수, '석차', '등급') 또는
+                          ('총점', '평균', '석차', '등급') 컬럼을 가진 표.
+        """
+        _, ds, _ = _arrow()
+        if subject == '전체':
+            columns = {'총점': '총점', '평균': '평균', '전체석차': '석차', '전체등급': '등급'}
+        else:
+            columns = {subject: subject, f'{subject}석차': '석차', f'{subject}등급': '등급'}
+        table = self.read([TERM_COLUMN, '학년', '반'] + list(columns), terms,
+                          filter=ds.field('학생ID') == str(student_id))
+        table = table.rename(columns=columns).sort_values(TERM_COLUMN, kind='stable')
+        return table.reset_index(drop=True)
+
+    @profiled('history_subject_trends', rows='output')
+    def subject_trends(self, subjects=None, terms=None, years=None):
+        """
+        학기 × 학년별 과목 평균 추이를 계산합니다. 학기/학년/과목 점수 컬럼만 읽습니다.
+
+        Args:
+            subjects (list, optional): 과목 목록. 지정하지 않으면 저장된 과목 전체.
+            terms (list, optional): 학기 목록. 지정하지 않으면 전체 학기.
+            years (list, optional): 학년 목록. 지정하지 않으면 전체 학년.
+
+        Returns:
+            pd.DataFrame: ('학기', '학년') 인덱스와 과목별 평균 컬럼을 가진 표.
+        """
+        _, ds, _ = _arrow()
+        terms = self.terms() if terms is None else [str(term) for term in terms if str(term) in self]
+        subjects = self.subjects(terms) if subjects is None else list(subjects)
+        condition = None if years is None else ds.field('학년').isin(list(years))
+        # 학기별로 학년 평균을 구한 뒤 이어 붙임 (학기 컬럼을 행마다 만들지 않음)
+        means = {}
+        for term in terms:
+            table = self.read(['학년'] + subjects, [term], filter=condition)
+            means[term] = table.groupby('학년').mean().reindex(columns=subjects)
+        if not means:
+            return pd.DataFrame(columns=subjects, index=pd.MultiIndex.from_tuples([], names=[TERM_COLUMN, '학년']))
+        return pd.concat(means, names=[TERM_COLUMN])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="GradeScope-EDA 학기별 성적 저장소")
+    parser.add_argument('--store', default=HISTORY_STORE_DIR, help="저장소 디렉터리")
+    commands = parser.add_subparsers(dest='command', required=True)
+    append = commands.add_parser('append', help="학기 하나의 CSV를 석차/등급과 함께 저장")
+    append.add_argument('term', help="학기 이름 (예: 2024-1)")
+    append.add_argument('--data', default='student_scores.csv', help="학생 성적 CSV 파일 경로")
+    append.add_argument('--policy', default=GRADE_SYSTEM, help="등급제 이름 (config.GRADE_POLICIES)")
+    trajectory = commands.add_parser('trajectory', help="학생 한 명의 학기별 석차/등급 변화")
+    trajectory.add_argument('student_id', help="학생ID")
+    trajectory.add_argument('--subject', default='전체', help="과목명 또는 '전체'")
+    trends = commands.add_parser('trends', help="학기 × 학년별 과목 평균 추이")
+    trends.add_argument('--years', nargs='+', type=int, help="학년 목록")
+    commands.add_parser('terms', help="저장된 학기 목록")
+    args = parser.parse_args(argv)
+
+    store = HistoryStore(args.store)
+    if args.command == 'append':
+        try:
+            path = store.append_csv(args.data, args.term, policy=args.policy)
+        except ValueError as e:
+            parser.exit(1, f"{e}\n")
+        print(f"{args.data} → {path} 저장 완료")
+    elif args.command == 'trajectory':
+        result = store.trajectory(args.student_id, args.subject)
+        if result.empty:
+            print(f"{args.student_id} 학생의 기록을 찾을 수 없습니다.")
+        else:
+            print(result.to_string(index=False))
+    elif args.command == 'trends':
+        print(store.subject_trends(years=args.years).round(1).to_string())
+    else:
+        print("\n".join(store.terms()) or "저장된 학기가 없습니다.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+# 일부 점수만 바뀌었을 때 학년 전체를 다시 정렬하지 않고 석차/등급을 갱신하는 기능 정의
+from bisect import bisect_left, bisect_right, insort
+
+import pandas as pd
+from config import GRADE_SYSTEM
+from data_loader import SCORE_RANGE, detect_subjects
+from grade_calculator import get_policy
+
+
+class FenwickTree:
+    """구간 합을 O(log n)에 계산/갱신하는 펜윅 트리(Binary Indexed Tree)."""
+
+    def __init__(self, size):
+        self.size = size
+        self._tree = [0] * (size + 1)
+
+    def add(self, index, delta):
+        index += 1
+        while index <= self.size:
+            self._tree[index] += delta
+            index += index & -index
+
+    def prefix(self, index):
+        """0 ~ index-1 위치 값의 합."""
+        total = 0
+        while index > 0:
+            total += self._tree[index]
+            index -= index & -index
+        return total
+
+
+class ScoreRanking:
+    """
+    한 그룹(학년)·한 과목의 정렬 상태를 점수 구간별 버킷과 펜윅 트리로 유지합니다.
+
+    버킷 b에는 점수가 (max_score - b)인 학생들의 키(원래 행 순서)가 정렬된 상태로 들어 있어,
+    석차(method='min')와 비율제 등급을 위한 정렬 위치를 O(log) 시간에 계산할 수 있습니다.
+    절대평가 등급제이면 등급은 점수만으로 정해집니다 (scale은 점수 하한에 곱할 값).
+    """
+
+    def __init__(self, scores, max_score, policy=GRADE_SYSTEM, scale=1):
+        self.max_score = max_score
+        self.scores = dict(scores)
+        self.policy = get_policy(policy)
+        self.scale = scale
+        if self.policy.kind == 'relative':
+            self.cutoffs = list(self.policy.cutoffs(len(self.scores)))
+        self._buckets = [[] for _ in range(max_score + 1)]
+        self._tree = FenwickTree(max_score + 1)
+        for key in sorted(self.scores):
+            bucket = self._bucket(self.scores[key])
+            self._buckets[bucket].append(key)
+            self._tree.add(bucket, 1)
+
+    def _bucket(self, score):
+        return self.max_score - score
+
+    def _grade(self, bucket, higher, offset):
+        # higher: 더 높은 점수의 학생 수, offset: 같은 점수 안에서의 순서
+        policy = self.policy
+        if policy.kind == 'absolute':
+            return int(policy.absolute_grades(self.max_score - bucket, self.scale))
+        position = higher if policy.ties == 'min' else higher + offset
+        return min(bisect_right(self.cutoffs, position) + 1, policy.levels)
+
+    def rank_and_grade(self, key):
+        """키(학생)의 (석차, 등급)을 반환합니다."""
+        bucket = self._bucket(self.scores[key])
+        higher = self._tree.prefix(bucket)
+        offset = bisect_left(self._buckets[bucket], key)
+        return higher + 1, self._grade(bucket, higher, offset)
+
+    def _snapshot(self, first, last):
+        # first~last 버킷에 속한 학생들의 (석차, 등급)
+        result = {}
+        higher = self._tree.prefix(first)
+        for bucket in range(first, last + 1):
+            keys = self._buckets[bucket]
+            for offset, key in enumerate(keys):
+                result[key] = (higher + 1, self._grade(bucket, higher, offset))
+            higher += len(keys)
+        return result
+
+    def update(self, key, score):
+        """
+        키(학생)의 점수를 바꾸고, 석차나 등급이 바뀐 학생만 반환합니다.
+
+        점수가 old → new로 바뀌면 두 점수 사이(양 끝 포함)에 있는 학생만 정렬 위치가
+        달라질 수 있으므로, 그 구간만 비교합니다.
+
+        Returns:
+            dict: 키 → ((이전 석차, 이전 등급), (새 석차, 새 등급))
+        """
+        old_bucket = self._bucket(self.scores[key])
+        new_bucket = self._bucket(score)
+        if old_bucket == new_bucket:
+            return {}
+        first, last = min(old_bucket, new_bucket), max(old_bucket, new_bucket)
+        before = self._snapshot(first, last)
+
+        bucket = self._buckets[old_bucket]
+        del bucket[bisect_left(bucket, key)]
+        self._tree.add(old_bucket, -1)
+        insort(self._buckets[new_bucket], key)
+        self._tree.add(new_bucket, 1)
+        self.scores[key] = score
+
+        after = self._snapshot(first, last)
+        return {k: (before[k], after[k]) for k in before if before[k] != after[k]}
+
+
+class IncrementalGrader:
+    """
+    학년별 과목/총점 석차와 등급을 유지하면서, 몇 개의 점수 수정만 반영해
+    바뀐 학생의 석차/등급만 돌려주는 증분 등급 계산기.
+
+    초기 석차/등급은 같은 등급제(policy)로 계산한 calculate_all_ranks_and_grades 결과와 같습니다
+    (ties='order' 등급제에서 동점자의 등급은 원래 행 순서를 따릅니다).
+    """
+
+    def __init__(self, df, subjects=None, policy=GRADE_SYSTEM):
+        self.subjects = list(detect_subjects(df) if subjects is None else subjects)
+        max_score = SCORE_RANGE[1]
+        scores = {subj: [int(value) for value in df[subj].to_numpy()] for subj in self.subjects}
+        totals = [sum(values) for values in zip(*scores.values())]
+
+        self._students = {}
+        self._rankings = {}
+        years = df['학년'].to_numpy()
+        members = {}
+        for key, (student_id, year) in enumerate(zip(df['학생ID'].to_numpy(), years)):
+            self._students[student_id] = (year, key)
+            members.setdefault(year, []).append(key)
+        for year, keys in members.items():
+            for subj in self.subjects:
+                self._rankings[year, subj] = ScoreRanking(
+                    {key: scores[subj][key] for key in keys}, max_score, policy)
+            self._rankings[year, '총점'] = ScoreRanking(
+                {key: totals[key] for key in keys}, max_score * len(self.subjects), policy, len(self.subjects))
+        self._ids = {key: student_id for student_id, (_, key) in self._students.items()}
+
+    def rank_and_grade(self, student_id, subject):
+        """
+        학생의 현재 (석차, 등급)을 반환합니다. subject에 '전체'를 넘기면 총점 기준입니다.
+        """
+        year, key = self._students[student_id]
+        column = '총점' if subject == '전체' else subject
+        return self._rankings[year, column].rank_and_grade(key)
+
+    def apply(self, deltas):
+        """
+        점수 수정 목록을 반영하고, 석차나 등급이 실제로 바뀐 학생만 반환합니다.
+
+        Args:
+            deltas (iterable): (학생ID, 과목, 새 점수) 목록.
+
+        Returns:
+            pd.DataFrame: '학생ID', '과목'(과목명 또는 '전체'), '이전석차', '석차',
+                          '이전등급', '등급' 컬럼을 가진 표.
+        """
+        low, high = SCORE_RANGE
+        changes = {}
+
+        def record(column, changed):
+            for key, (before, after) in changed.items():
+                name = '전체' if column == '총점' else column
+                first_before = changes.get((key, name), (before, None))[0]
+                changes[key, name] = (first_before, after)
+
+        for student_id, subject, score in deltas:
+            if subject not in self.subjects:
+                raise ValueError(f"알 수 없는 과목입니다: {subject}")
+            if score != int(score) or not low <= score <= high:
+                raise ValueError(f"점수는 {low}~{high} 사이의 정수여야 합니다: {score}")
+            year, key = self._students[student_id]
+            subject_ranking = self._rankings[year, subject]
+            total_ranking = self._rankings[year, '총점']
+            diff = int(score) - subject_ranking.scores[key]
+            record(subject, subject_ranking.update(key, int(score)))
+            record('총점', total_ranking.update(key, total_ranking.scores[key] + diff))
+
+        rows = [
+            {'학생ID': self._ids[key], '과목': name, '이전석차': before[0], '석차': after[0],
+             '이전등급': before[1], '등급': after[1]}
+            for (key, name), (before, after) in changes.items() if before != after
+        ]
+        return pd.DataFrame(rows, columns=['학생ID', '과목', '이전석차', '석차', '이전등급', '등급'])
@@ -0,0 +1,101 @@
+# 조회 서버(query_server.py) 부하 테스트: 동시 연결 수만큼 요청을 보내 지연 시간(p50/p99)과 QPS 측정
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import numpy as np
+import pandas as pd
+from config import SERVER_HOST, SERVER_PORT
+
+# 요청 종류별 기본 비율 (조회가 대부분이고 상위 k명/반 요약은 가끔)
+DEFAULT_MIX = {'lookup': 0.9, 'top_k': 0.05, 'class_summary': 0.05}
+
+
+def make_request(rng, ids, info, batch=1):
+    """DEFAULT_MIX 비율에 따라 임의의 요청 하나(dict)를 만듭니다."""
+    op = rng.choices(list(DEFAULT_MIX), weights=list(DEFAULT_MIX.values()))[0]
+    if op == 'lookup':
+        subject = rng.choice(info['subjects'] + ['전체'])
+        if batch > 1:
+            return {'op': 'lookup', 'ids': rng.sample(ids, min(batch, len(ids))), 'subject': subject}
+        return {'op': 'lookup', 'id': rng.choice(ids), 'subject': subject}
+    if op == 'top_k':
+        return {'op': 'top_k', 'year': rng.choice(info['years']), 'subject': rng.choice(info['subjects']), 'k': 10}
+    return {'op': 'class_summary', 'year': rng.choice(info['years'])}
+
+
+async def _call(reader, writer, request):
+    writer.write(json.dumps(request, ensure_ascii=False).encode('utf-8') + b'\n')
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+async def _client(host, port, requests, latencies, errors):
+    # 연결 하나에서 요청을 하나씩 보내고 응답을 받을 때까지의 시간을 기록
+    reader, writer = await asyncio.open_connection(host, port, limit=1 << 22)
+    try:
+        for request in requests:
+            started = time.perf_counter()
+            response = await _call(reader, writer, request)
+            latencies.append(time.perf_counter() - started)
+            if not response.get('ok'):
+                errors.append(response.get('error'))
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run_load_test(host, port, ids, connections=16, requests=1000, batch=1, seed=0):
+    """
+    connections개의 연결에서 각각 requests개의 요청을 보내고 결과를 요약합니다.
+
+    Returns:
+        dict: 요청 수, 오류 수, 전체 시간, QPS, 지연 시간(p50/p99/최대, 밀리초).
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    info = (await _call(reader, writer, {'op': 'info'}))['result']
+    writer.close()
+    await writer.wait_closed()
+
+    rng = random.Random(seed)
+    plans = [[make_request(rng, ids, info, batch) for _ in range(requests)] for _ in range(connections)]
+    latencies, errors = [], []
+    started = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, plan, latencies, errors) for plan in plans))
+    elapsed = time.perf_counter() - started
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        '요청수': len(latencies),
+        '오류수': len(errors),
+        '시간(s)': elapsed,
+        'QPS': len(latencies) / elapsed,
+        'p50(ms)': float(np.percentile(latencies_ms, 50)),
+        'p99(ms)': float(np.percentile(latencies_ms, 99)),
+        '최대(ms)': float(latencies_ms.max()),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="조회 서버 부하 테스트")
+    parser.add_argument('--data', default='student_scores.csv', help="조회할 학생ID를 뽑을 CSV 파일 경로")
+    parser.add_argument('--host', default=SERVER_HOST, help="서버 주소")
+    parser.add_argument('--port', type=int, default=SERVER_PORT, help="서버 포트")
+    parser.add_argument('--connections', type=int, default=16, help="동시 연결 수")
+    parser.add_argument('--requests', type=int, default=1000, help="연결마다 보낼 요청 수")
+    parser.add_argument('--batch', type=int, default=1, help="조회 요청 하나에 담을 학생 수")
+    parser.add_argument('--seed', type=int, default=0, help="요청 생성 난수 시드")
+    args = parser.parse_args(argv)
+
+    ids = pd.read_csv(args.data, usecols=['학생ID'])['학생ID'].astype(str).tolist()
+    result = asyncio.run(run_load_test(args.host, args.port, ids, args.connections,
+                                       args.requests, args.batch, args.seed))
+    for key, value in result.items():
+        print(f"{key:<10} {value:,.3f}" if isinstance(value, float) else f"{key:<10} {value:,}")
+    return 1 if result['오류수'] else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
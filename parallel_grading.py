@@ -0,0 +1,58 @@
+# 여러 학교/학년 명단을 나눠(shard) 프로세스 풀에서 병렬로 석차·등급을 계산하는 함수 정의
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+from config import GRADE_SYSTEM, GRADING_WORKERS
+from data_loader import detect_subjects
+from rank_and_grade import calculate_all_ranks_and_grades
+
+
+def grading_groups(df):
+    """석차/등급을 나눠 매기는 기준 컬럼. 학교 컬럼이 있으면 학교 × 학년, 없으면 학년."""
+    return ('학교', '학년') if '학교' in df.columns else ('학년',)
+
+
+def _grade_shard(shard, subjects, group_by, policy):
+    return calculate_all_ranks_and_grades(shard, subjects=subjects, group_by=group_by, policy=policy)
+
+
+def grade_in_parallel(df, shard_by=None, workers=GRADING_WORKERS, subjects=None, policy=GRADE_SYSTEM):
+    """
+    명단을 학교(또는 학년)별로 나눠 여러 프로세스에서 독립적으로 석차/등급을 계산한 뒤
+    하나의 표로 합칩니다. 결과는 calculate_all_ranks_and_grades를 한 번에 실행한
+    결과와 같습니다(행 순서 포함).
+
+    Args:
+        df (pd.DataFrame): '학생ID', '학년'과 과목 점수 컬럼이 존재하는 DataFrame.
+                           '학교' 컬럼이 있으면 학교 × 학년 단위로 석차/등급을 매깁니다.
+        shard_by (str, optional): 작업을 나눌 기준 컬럼. 석차/등급 기준 컬럼 중 하나여야 하며,
+                                  지정하지 않으면 '학교'(없으면 '학년')를 사용합니다.
+        workers (int, optional): 작업 프로세스 수. None이면 CPU 코어 수, 1이면 병렬 처리 없이 실행합니다.
+        subjects (list, optional): 석차/등급을 계산할 과목 목록. 지정하지 않으면 detect_subjects 결과.
+        policy (str): config.GRADE_POLICIES의 등급제 이름.
+
+    Returns:
+        pd.DataFrame: calculate_all_ranks_and_grades와 같은 형식의 결과.
+    """
+    group_by = grading_groups(df)
+    if shard_by is None:
+        shard_by = group_by[0]
+    if shard_by not in group_by:
+        # 석차/등급 기준 그룹이 여러 작업에 걸치면 작업별 결과가 전체 결과와 달라짐
+        raise ValueError(f"shard_by는 {list(group_by)} 중 하나여야 합니다: {shard_by}")
+    subjects = list(detect_subjects(df) if subjects is None else subjects)
+
+    shard_positions = list(df.groupby(shard_by, sort=False, observed=True).indices.values())
+    if workers == 1 or len(shard_positions) <= 1:
+        return calculate_all_ranks_and_grades(df, subjects=subjects, group_by=group_by, policy=policy)
+
+    shards = (df.iloc[positions] for positions in shard_positions)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_grade_shard, shards, repeat(subjects), repeat(group_by), repeat(policy)))
+
+    # 작업별 결과를 이어 붙인 뒤 원래 행 순서로 복원
+    merged = pd.concat(results)
+    order = np.argsort(np.concatenate(shard_positions), kind='stable')
+    return merged.iloc[order]
@@ -0,0 +1,126 @@
+# 분석 파이프라인 주요 단계(로딩, 등급 계산, 조회, 분석 단계, 그래프)의 실행 시간/호출 수 측정 기능
+import cProfile
+import functools
+import json
+import os
+import time
+from contextlib import contextmanager
+
+# 환경 변수 GRADESCOPE_PROFILE=1 이면 시작부터 측정, 아니면 enable() 호출 전까지 측정하지 않음
+_enabled = os.environ.get('GRADESCOPE_PROFILE', '') not in ('', '0')
+_stats = {}
+
+
+def enable():
+    """측정을 켭니다."""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """측정을 끕니다. (꺼져 있을 때는 함수 호출마다 플래그 확인만 합니다.)"""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """지금까지 누적한 측정 결과를 지웁니다."""
+    _stats.clear()
+
+
+def record(name, seconds=0.0, rows=0, declared_copies=0, calls=1):
+    """
+    측정 항목 name에 호출 수, 누적 시간, 처리 행 수, 선언된 DataFrame 복사 횟수를 더합니다.
+    (복사 횟수는 측정값이 아니라 각 측정 지점에서 선언한 값의 합입니다.)
+    """
+    entry = _stats.get(name)
+    if entry is None:
+        entry = _stats[name] = {'calls': 0, 'seconds': 0.0, 'rows': 0, 'declared_copies': 0}
+    entry['calls'] += calls
+    entry['seconds'] += seconds
+    entry['rows'] += rows
+    entry['declared_copies'] += declared_copies
+
+
+def _count_rows(rows, args, result):
+    if rows == 'input':
+        return len(args[0]) if args and hasattr(args[0], 'columns') else 0
+    if rows == 'output':
+        return len(result) if hasattr(result, 'columns') else 0
+    return rows
+
+
+def profiled(name, rows='input', declared_copies=0):
+    """
+    함수 실행 시간/호출 수/처리 행 수/선언된 DataFrame 복사 횟수를 기록하는 데코레이터.
+
+    Args:
+        name (str): 측정 항목 이름.
+        rows (str | int): 'input'이면 첫 번째 인자(DataFrame)의 행 수, 'output'이면 반환
+                          DataFrame의 행 수, 정수이면 그 값을 처리 행 수로 기록합니다.
+        declared_copies (int): 한 번 호출할 때 만드는 것으로 선언한 DataFrame 복사본 수. (실제로 세지 않음)
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            result = None
+            try:
+                result = func(*args, **kwargs)
+                return result
+            finally:
+                record(name, time.perf_counter() - started, _count_rows(rows, args, result), declared_copies)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def stage(name, rows=0, declared_copies=0):
+    """with 블록 하나를 측정 항목 name으로 기록하는 컨텍스트 매니저."""
+    if not _enabled:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started, rows, declared_copies)
+
+
+def snapshot():
+    """측정 결과를 누적 시간 내림차순으로 정렬한 dict로 반환합니다."""
+    from aggregation_cache import cache_info
+    items = sorted(_stats.items(), key=lambda item: item[1]['seconds'], reverse=True)
+    return {'stages': {name: dict(entry) for name, entry in items}, 'aggregation_cache': cache_info()}
+
+
+def format_report():
+    """측정 결과를 표 형태의 문자열로 반환합니다."""
+    lines = [f"{'항목':<40} {'호출':>7} {'누적(s)':>10} {'행 수':>12} {'복사(선언)':>8}"]
+    for name, entry in snapshot()['stages'].items():
+        lines.append(f"{name:<40} {entry['calls']:>7} {entry['seconds']:>10.4f} {entry['rows']:>12} {entry['declared_copies']:>8}")
+    return "\n".join(lines)
+
+
+def dump_json(path):
+    """측정 결과를 JSON 파일로 저장합니다."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot(), f, ensure_ascii=False, indent=2)
+
+
+@contextmanager
+def cprofile(path):
+    """with 블록 실행을 cProfile로 측정해 pstats 형식 파일로 저장합니다. (snakeviz 등으로 확인)"""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
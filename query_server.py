@@ -0,0 +1,284 @@
+# 학생 석차/등급 조회 서버 (asyncio, JSON 한 줄 요청/응답 프로토콜)
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from config import SERVER_DATA_DIR, SERVER_HOST, SERVER_PORT, SERVER_TOP_K_LIMIT
+from data_loader import detect_subjects, load_data
+from grade_index import GradeIndex
+from rank_and_grade import get_ranks_and_grades
+from top_k import top_k
+
+# 한 줄 요청의 최대 길이 (여러 학생을 한 번에 조회하는 요청도 받을 수 있도록 넉넉하게)
+MAX_REQUEST_BYTES = 1 << 20
+
+
+class Snapshot:
+    """
+    서버가 응답에 사용하는 읽기 전용 데이터셋 스냅숏.
+
+    불러온 명단으로 학생ID 인덱스, (학년, 반)별 요약, 학년 × 과목별 상위 SERVER_TOP_K_LIMIT명을
+    한 번에 만들어 둡니다. 명단 전체 크기의 석차/등급표는 스냅숏을 만드는 동안만 사용하고
+    보관하지 않으므로, 서버에는 압축된 GradeIndex와 작은 요약표만 남습니다.
+    새 데이터셋을 불러오면 새 스냅숏을 만들어 통째로 교체하므로, 처리 중인 요청은
+    시작할 때 잡은 스냅숏으로 끝까지 응답합니다.
+    """
+
+    def __init__(self, df, source, version, subjects=None):
+        self.source = source
+        self.version = version
+        self.loaded_at = time.time()
+        self.subjects = detect_subjects(df) if subjects is None else [subj for subj in subjects if subj in df.columns]
+        self.rows = len(df)
+        self.index = GradeIndex.from_frame(df, self.subjects)
+
+        # GradeIndex를 만들 때 계산해 캐시된 석차/등급표를 그대로 사용 (전체 명단을 한 번만 등급 계산)
+        ranks = get_ranks_and_grades(df, subjects=self.subjects)
+        table = ranks.assign(**{subj: df[subj] for subj in self.subjects})
+        self.years = sorted(int(year) for year in table['학년'].unique())
+        self.class_summaries = self._summarize_classes(table)
+        self.top_tables = self._select_top(table)
+
+    def _summarize_classes(self, table):
+        if '반' not in table.columns:
+            return {}
+        grouped = table.groupby(['학년', '반'], observed=True)
+        means = grouped[self.subjects + ['총점']].mean().round(2)
+        counts = grouped.size()
+        grades = grouped['전체등급'].value_counts().unstack(fill_value=0)
+        summaries = {}
+        for (year, class_name), row in means.iterrows():
+            summaries[int(year), str(class_name)] = {
+                '학년': int(year),
+                '반': str(class_name),
+                '인원': int(counts[year, class_name]),
+                '과목평균': {subj: float(row[subj]) for subj in self.subjects},
+                '총점평균': float(row['총점']),
+                '전체등급분포': {int(grade): int(count)
+                             for grade, count in grades.loc[(year, class_name)].items() if count},
+            }
+        return summaries
+
+    def _select_top(self, table):
+        # 학년 × 과목별 상위 SERVER_TOP_K_LIMIT명 (상위 k명 요청은 이 표의 앞 k행으로 응답)
+        tops = {}
+        for year, positions in table.groupby('학년', observed=True).indices.items():
+            year_table = table.iloc[positions]
+            for subj in self.subjects:
+                selected = top_k(year_table, subj, SERVER_TOP_K_LIMIT, keep='first')
+                tops[int(year), subj] = pd.DataFrame({
+                    '학생ID': selected['학생ID'].to_numpy(),
+                    '반': selected['반'].to_numpy(),
+                    subj: selected[subj].to_numpy(),
+                    '석차': selected[f'{subj}석차'].to_numpy(),
+                    '과목등급': selected[f'{subj}등급'].to_numpy(),
+                })
+        return tops
+
+    def lookup(self, student_id, subject='전체'):
+        record = self.index.get(student_id)
+        if record is None:
+            return None
+        if subject == '전체':
+            return record
+        if subject not in record['점수']:
+            raise ValueError(f"알 수 없는 과목입니다: {subject}")
+        return {'학생ID': record['학생ID'], '학년': record['학년'], '반': record['반'],
+                subject: record['점수'][subject], '석차': record['석차'][subject],
+                '과목등급': record['과목등급'][subject], '전체등급': record['전체등급']}
+
+    def top_k(self, year, subject, k=10):
+        """학년/과목 상위 k명 (k는 SERVER_TOP_K_LIMIT 이하, 미리 선택한 표의 앞 k행)."""
+        if subject not in self.subjects:
+            raise ValueError(f"알 수 없는 과목입니다: {subject}")
+        table = self.top_tables.get((year, subject))
+        if table is None:
+            return []
+        return table.iloc[:k].to_dict('records')
+
+    def class_summary(self, year, class_name=None):
+        if class_name is None:
+            return [summary for (summary_year, _), summary in sorted(self.class_summaries.items())
+                    if summary_year == year]
+        return self.class_summaries.get((year, class_name))
+
+    def info(self):
+        return {'source': self.source, 'version': self.version, 'rows': self.rows,
+                'subjects': self.subjects, 'years': self.years,
+                'loaded_at': self.loaded_at}
+
+
+def build_snapshot(file_path, version):
+    """CSV를 불러와 스냅숏을 만듭니다. (작업 프로세스에서 실행되어 이벤트 루프를 막지 않습니다.)"""
+    return Snapshot(load_data(file_path, typed=True), file_path, version)
+
+
+def _to_json(value):
+    # NumPy 정수/실수 등 json 모듈이 모르는 값을 기본 자료형으로 변환
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+class QueryServer:
+    """
+    스냅숏 하나를 공유하며 여러 연결의 요청을 동시에 처리하는 조회 서버.
+
+    요청과 응답은 모두 JSON 한 줄입니다. 한 연결에서 여러 요청을 연달아 보내도 되며,
+    응답은 요청 순서대로 돌아옵니다. 요청에 'seq' 값을 넣으면 응답에 그대로 돌려줍니다.
+
+        {"op": "lookup", "id": "S1005", "subject": "수학"}
+        {"op": "lookup", "ids": ["S1005", "S1006"]}
+        {"op": "top_k", "year": 1, "subject": "수학", "k": 10}
+        {"op": "class_summary", "year": 1, "class": "A"}
+        {"op": "batch", "requests": [{"op": "lookup", "id": "S1005"}, ...]}
+        {"op": "info"}
+        {"op": "reload", "path": "student_scores.csv"}
+
+    reload의 path는 데이터 디렉터리(data_dir) 안의 CSV 파일만 허용합니다.
+
+    응답: {"ok": true, "version": 스냅숏 버전, "result": ...} 또는 {"ok": false, "error": "..."}
+    """
+
+    def __init__(self, data_path, executor=None, data_dir=SERVER_DATA_DIR):
+        self.data_path = data_path
+        self.data_dir = os.path.realpath(data_dir or os.path.dirname(os.path.abspath(data_path)))
+        self.snapshot = None
+        self.executor = executor or ProcessPoolExecutor(max_workers=1)
+        self._reload_lock = asyncio.Lock()
+        self._next_version = 1
+
+    def resolve_data_path(self, path):
+        """
+        reload 요청의 path를 데이터 디렉터리 기준 실제 경로로 바꿉니다.
+        데이터 디렉터리 밖의 파일이나 CSV가 아닌 파일이면 ValueError를 발생시킵니다.
+        """
+        resolved = os.path.realpath(os.path.join(self.data_dir, str(path)))
+        if os.path.commonpath([resolved, self.data_dir]) != self.data_dir or not resolved.endswith('.csv'):
+            raise ValueError(f"데이터 디렉터리 밖의 파일이거나 CSV 파일이 아닙니다: {path}")
+        if not os.path.isfile(resolved):
+            raise ValueError(f"파일을 찾을 수 없습니다: {path}")
+        return resolved
+
+    async def reload(self, path=None):
+        """
+        새 데이터셋을 작업 프로세스에서 불러오고 석차/등급을 다시 계산한 뒤 스냅숏을 교체합니다.
+        교체는 참조 하나를 바꾸는 것이므로, 처리 중인 요청은 이전 스냅숏으로 끝까지 응답합니다.
+        path를 지정하면 데이터 디렉터리 안의 CSV만 불러옵니다. (resolve_data_path 참고)
+        """
+        async with self._reload_lock:
+            path = self.data_path if path is None else self.resolve_data_path(path)
+            version = self._next_version
+            loop = asyncio.get_running_loop()
+            snapshot = await loop.run_in_executor(self.executor, build_snapshot, path, version)
+            self._next_version += 1
+            self.data_path = path
+            self.snapshot = snapshot
+            return snapshot.info()
+
+    def _execute(self, snapshot, request):
+        op = request.get('op')
+        if op == 'lookup':
+            subject = request.get('subject', '전체')
+            if 'ids' in request:
+                return [snapshot.lookup(student_id, subject) for student_id in request['ids']]
+            return snapshot.lookup(request['id'], subject)
+        if op == 'top_k':
+            k = int(request.get('k', 10))
+            if not 0 < k <= SERVER_TOP_K_LIMIT:
+                raise ValueError(f"k는 1~{SERVER_TOP_K_LIMIT} 사이여야 합니다: {k}")
+            return snapshot.top_k(int(request['year']), request['subject'], k)
+        if op == 'class_summary':
+            return snapshot.class_summary(int(request['year']), request.get('class'))
+        if op == 'batch':
+            return [self._respond(snapshot, item) for item in request['requests']]
+        if op == 'info':
+            return snapshot.info()
+        raise ValueError(f"알 수 없는 요청입니다: {op}")
+
+    def _respond(self, snapshot, request):
+        if not isinstance(request, dict):
+            return {'ok': False, 'error': "요청은 JSON 객체여야 합니다."}
+        try:
+            response = {'ok': True, 'version': snapshot.version, 'result': self._execute(snapshot, request)}
+        except Exception as e:
+            # 잘못된 요청(예: 범위를 벗어난 숫자)으로 연결이 끊기지 않도록 모든 오류를 응답으로 돌려줌
+            response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+        if 'seq' in request:
+            response['seq'] = request['seq']
+        return response
+
+    async def handle(self, request):
+        """요청 하나(dict)를 처리해 응답(dict)을 반환합니다."""
+        if isinstance(request, dict) and request.get('op') == 'reload':
+            try:
+                response = {'ok': True, 'result': await self.reload(request.get('path'))}
+            except Exception as e:
+                response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+            if 'seq' in request:
+                response['seq'] = request['seq']
+            return response
+        # 요청을 시작할 때의 스냅숏을 끝까지 사용
+        return self._respond(self.snapshot, request)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    writer.write(b'{"ok": false, "error": "request too long"}\n')
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                except ValueError as e:
+                    response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+                else:
+                    response = await self.handle(request)
+                writer.write(json.dumps(response, ensure_ascii=False, default=_to_json).encode('utf-8') + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host=SERVER_HOST, port=SERVER_PORT):
+        """데이터셋을 불러온 뒤 연결을 받기 시작합니다. (asyncio.Server 반환)"""
+        if self.snapshot is None:
+            await self.reload()
+        return await asyncio.start_server(self.handle_connection, host, port, limit=MAX_REQUEST_BYTES)
+
+
+async def _main(args):
+    server = QueryServer(args.data, data_dir=args.data_dir)
+    listener = await server.serve(args.host, args.port)
+    info = server.snapshot.info()
+    print(f"{info['source']} ({info['rows']}행, 버전 {info['version']}) 조회 서버 시작: {args.host}:{args.port}")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="GradeScope-EDA 학생 석차/등급 조회 서버")
+    parser.add_argument('--data', default='student_scores.csv', help="학생 성적 CSV 파일 경로")
+    parser.add_argument('--host', default=SERVER_HOST, help="접속을 받을 주소")
+    parser.add_argument('--port', type=int, default=SERVER_PORT, help="접속을 받을 포트")
+    parser.add_argument('--data-dir', default=SERVER_DATA_DIR,
+                        help="reload 요청으로 불러올 수 있는 CSV 디렉터리 (기본: --data 파일의 디렉터리)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        print("조회 서버를 종료합니다.")
+
+
+if __name__ == '__main__':
+    main()
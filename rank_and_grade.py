@@ -1,42 +1,87 @@
+import numpy as np
 import pandas as pd
-from grade_calculator import assign_grades
+from grade_calculator import rank_and_grade_scores
 from config import GRADE_SYSTEM
+from data_loader import detect_subjects
+from aggregation_cache import memoized
+from profiling import profiled
 
-def calculate_rank_and_grade(df, year, subject):
-    # 과목별 점수 컬럼 선택
-    if subject == "수학":
-        score_column = "수학"
-    elif subject == "영어":
-        score_column = "영어"
-    else:
-        score_column = "과학"
-    
-    # 해당 학년의 데이터 필터링
-    year_df = df[df['학년'] == year].copy()
-    import pandas as pd
-from grade_calculator import assign_grades
-from config import GRADE_SYSTEM
+@profiled('calculate_rank_and_grade')
+def calculate_rank_and_grade(df, year, subject, policy=GRADE_SYSTEM):
+    # 과목 점수 컬럼 선택
+    if subject not in df.columns:
+        raise ValueError(f"알 수 없는 과목입니다: {subject}")
 
-def calculate_rank_and_grade(df, year, subject):
-    # 과목별 점수 컬럼 선택
-    if subject == "수학":
-        score_column = "수학"
-    elif subject == "영어":
-        score_column = "영어"
-    else:
-        score_column = "과학"
-    
     # 해당 학년의 데이터 필터링
-    year_df = df[df['학년'] == year].copy()
-    if year_df.empty:
+    year_mask = (df['학년'] == year).to_numpy()
+    if not year_mask.any():
         return pd.DataFrame()  # 해당 학년 데이터가 없는 경우
 
-    # 석차 계산 (해당 학년 내에서)
-    year_df['석차'] = year_df[score_column].rank(ascending=False, method='min').astype(int)
+    # 석차/과목 등급 계산 (해당 학년 내에서, 해당 과목 점수 기준)
+    ranks, grades = rank_and_grade_scores(df.loc[year_mask, subject].to_numpy(), policy)
+    return pd.DataFrame({
+        '학생ID': df.loc[year_mask, '학생ID'],
+        '석차': ranks,
+        '등급': grades,
+    })
+
+@profiled('calculate_all_ranks_and_grades', declared_copies=1)
+def calculate_all_ranks_and_grades(df, years=None, subjects=None, group_by=('학년',),
+                                   policy=GRADE_SYSTEM):
+    """
+    모든 학년 × 과목의 석차/등급과 전체(총점 기준) 석차/등급을 한 번에 계산합니다.
+
+    학년별로 따로 필터링하지 않고, (학생 수 × (과목 수 + 1)) 점수 행렬 하나에서
+    모든 과목과 총점의 그룹 안 석차/등급을 한 번에 계산합니다.
+
+    Args:
+        df (pd.DataFrame): '학생ID', '학년'과 과목 점수 컬럼이 존재하는 DataFrame.
+        years (list, optional): 계산할 학년 목록. 지정하지 않으면 전체 학년.
+        subjects (list, optional): 석차/등급을 계산할 과목 목록. 지정하지 않으면 detect_subjects 결과.
+        group_by (tuple): 석차/등급을 나눠 매기는 기준 컬럼 (예: ('학교', '학년')).
+        policy (str): config.GRADE_POLICIES의 등급제 이름.
+
+    Returns:
+        pd.DataFrame: 학생별 한 행으로 구성된 결과.
+                      '학생ID', (group_by 컬럼), ('반'), '{과목}석차', '{과목}등급', ...,
+                      '총점', '평균', '전체석차', '전체등급' 컬럼을 가집니다.
+    """
+    subjects = list(detect_subjects(df) if subjects is None else subjects)
+    if years is not None:
+        df = df[df['학년'].isin(years)]
+
+    values = df[subjects].to_numpy()
+    totals = values.sum(axis=1, dtype=np.int64 if values.dtype.kind in 'iu' else np.float64)
+    scores = np.column_stack([values.astype(np.float64), totals])
+    group_by = list(group_by)
+    group_codes = df.groupby(group_by, sort=False, observed=True).ngroup().to_numpy()
+
+    # 그룹(학년) 내 석차 (method='min') / 그룹 내 등급 (등급제에 따라 비율제 또는 절대평가)
+    ranks, grades = rank_and_grade_scores(scores, policy, groups=group_codes,
+                                          scale=[1] * len(subjects) + [len(subjects)])
+
+    key_columns = ['학생ID'] + group_by + (['반'] if '반' in df.columns and '반' not in group_by else [])
+    result = {column: df[column] for column in key_columns}
+    for i, subj in enumerate(subjects):
+        result[f'{subj}석차'] = ranks[:, i]
+        result[f'{subj}등급'] = grades[:, i]
+    result['총점'] = totals
+    result['평균'] = totals / len(subjects)
+    result['전체석차'] = ranks[:, -1]
+    result['전체등급'] = grades[:, -1]
+    return pd.DataFrame(result, index=df.index)
+
+def get_ranks_and_grades(df, years=None, subjects=None, policy=GRADE_SYSTEM, group_by=('학년',)):
+    """
+    calculate_all_ranks_and_grades 결과를 데이터셋별로 캐시해 반환합니다.
+    (반환된 표는 여러 호출에서 공유되므로 직접 수정하지 않습니다.)
 
-    # 과목별 등급 계산 (해당 과목 점수 기준)
-    from grade_calculator import assign_subject_grades
-    year_df_with_subject_grades = assign_subject_grades(year_df[['학생ID', score_column]], score_column)
-    year_df['등급'] = year_df_with_subject_grades['등급'].values
+    subjects를 지정하지 않으면 detect_subjects 결과를 사용하며, 과목 목록을 직접 넘긴 호출과
+    같은 캐시 항목을 공유합니다.
+    """
+    subjects = detect_subjects(df) if subjects is None else list(subjects)
+    return _cached_ranks_and_grades(df, years, subjects, policy, tuple(group_by))
 
-    return year_df[['학생ID', '석차', '등급']]
\ No newline at end of file
+@memoized('ranks_and_grades')
+def _cached_ranks_and_grades(df, years, subjects, policy, group_by):
+    return calculate_all_ranks_and_grades(df, years, subjects, group_by=group_by, policy=policy)
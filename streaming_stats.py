@@ -0,0 +1,205 @@
+# 덩어리(chunk) 단위로 한 번만 훑으면서 기술통계/상관계수/단순 선형회귀를 계산하는 누적기 정의
+import numpy as np
+import pandas as pd
+from aggregation_cache import memoized
+from config import DEFAULT_SUBJECTS, LOAD_CHUNKSIZE, QUANTILE_RESOLUTION
+from data_loader import ATTENDANCE_RANGE, SCORE_RANGE, detect_subjects, iter_data_chunks
+
+
+class HistogramSketch:
+    """
+    [low, high] 구간을 resolution 간격의 칸으로 나눠 값의 개수를 세는 분위수 스케치.
+
+    칸별 개수만 더하면 되므로 여러 덩어리/작업 결과를 정확히 합칠 수 있고,
+    값이 칸 간격의 배수(정수 점수, 소수 첫째 자리 출석률 등)이면 분위수도 정확합니다.
+    """
+
+    def __init__(self, low, high, resolution=QUANTILE_RESOLUTION):
+        self.low = low
+        self.resolution = resolution
+        self.counts = np.zeros(int(round((high - low) / resolution)) + 1, dtype=np.int64)
+
+    def update(self, values):
+        bins = np.rint((values - self.low) / self.resolution).astype(np.int64)
+        self.counts += np.bincount(np.clip(bins, 0, len(self.counts) - 1), minlength=len(self.counts))
+
+    def merge(self, other):
+        self.counts += other.counts
+        return self
+
+    def quantile(self, q):
+        """pandas의 quantile(linear 보간)과 같은 방식으로 분위수를 계산합니다."""
+        n = self.counts.sum()
+        if n == 0:
+            return np.nan
+        cumulative = np.cumsum(self.counts)
+        position = (n - 1) * q
+        below = int(np.floor(position))
+        lower = np.searchsorted(cumulative, below, side='right')
+        upper = np.searchsorted(cumulative, min(below + 1, n - 1), side='right')
+        lower_value = self.low + lower * self.resolution
+        upper_value = self.low + upper * self.resolution
+        return lower_value + (upper_value - lower_value) * (position - below)
+
+
+class StreamingStats:
+    """
+    평균/M2/공적률(co-moment)을 Welford/Chan 방식으로 누적하는 한 번 통과(one-pass) 통계 엔진.
+
+    update()로 덩어리를 하나씩 넣거나, 다른 작업에서 만든 누적기를 merge()로 합칠 수 있으며
+    합친 결과는 전체를 한 번에 계산한 결과와 같습니다. 상관계수/회귀는 모든 컬럼 값이
+    있는 행만 사용합니다.
+
+    Args:
+        columns (list): 누적할 컬럼 목록.
+        ranges (dict, optional): 컬럼 → (최솟값, 최댓값). 지정한 컬럼만 분위수 스케치를 만듭니다.
+        resolution (float): 분위수 스케치 칸 간격.
+        total_of (list, optional): columns에 '총점'이 있고 덩어리에 없을 때 합산할 과목 목록.
+    """
+
+    def __init__(self, columns, ranges=None, resolution=QUANTILE_RESOLUTION, total_of=DEFAULT_SUBJECTS):
+        self.columns = list(columns)
+        self.total_of = list(total_of)
+        k = len(self.columns)
+        self.n = 0
+        self.mean = np.zeros(k)
+        self.comoment = np.zeros((k, k))
+        self.minimum = np.full(k, np.inf)
+        self.maximum = np.full(k, -np.inf)
+        ranges = ranges or {}
+        self.sketches = {column: HistogramSketch(*ranges[column], resolution)
+                         for column in self.columns if column in ranges}
+
+    def update(self, chunk):
+        """덩어리(DataFrame)의 값을 누적합니다. 없는 '총점' 컬럼은 과목 점수 합으로 계산합니다."""
+        if '총점' in self.columns and '총점' not in chunk.columns:
+            chunk = chunk.assign(총점=chunk[self.total_of].sum(axis=1))
+        values = chunk[self.columns].to_numpy(dtype=np.float64)
+        values = values[~np.isnan(values).any(axis=1)]
+        if len(values) == 0:
+            return self
+        other = StreamingStats(self.columns)
+        other.n = len(values)
+        other.mean = values.mean(axis=0)
+        centered = values - other.mean
+        other.comoment = centered.T @ centered
+        other.minimum = values.min(axis=0)
+        other.maximum = values.max(axis=0)
+        for column, sketch in self.sketches.items():
+            sketch.update(values[:, self.columns.index(column)])
+        return self._merge_moments(other)
+
+    def _merge_moments(self, other):
+        n = self.n + other.n
+        if other.n == 0:
+            return self
+        delta = other.mean - self.mean
+        self.comoment = self.comoment + other.comoment + np.outer(delta, delta) * self.n * other.n / n
+        self.mean = self.mean + delta * other.n / n
+        self.n = n
+        self.minimum = np.minimum(self.minimum, other.minimum)
+        self.maximum = np.maximum(self.maximum, other.maximum)
+        return self
+
+    def merge(self, other):
+        """다른 누적기(같은 컬럼 구성)의 결과를 합칩니다."""
+        for column, sketch in self.sketches.items():
+            sketch.merge(other.sketches[column])
+        return self._merge_moments(other)
+
+    def describe(self, columns=None):
+        """
+        컬럼별 평균/표준편차/최솟값/최댓값/중앙값/1사분위수/3사분위수 표를 반환합니다.
+        (분위수는 스케치가 있는 컬럼만 계산합니다.)
+        """
+        columns = list(columns or self.columns)
+        positions = [self.columns.index(column) for column in columns]
+        variance = np.diag(self.comoment)[positions] / (self.n - 1) if self.n > 1 else np.full(len(columns), np.nan)
+        table = pd.DataFrame({
+            '평균': self.mean[positions],
+            '표준편차': np.sqrt(variance),
+            '최솟값': self.minimum[positions],
+            '최댓값': self.maximum[positions],
+        }, index=columns)
+        for label, q in (('중앙값', 0.5), ('1사분위수', 0.25), ('3사분위수', 0.75)):
+            table[label] = [self.sketches[column].quantile(q) if column in self.sketches else np.nan
+                            for column in columns]
+        return table.T
+
+    def correlation(self, columns=None):
+        """피어슨 상관 행렬을 반환합니다."""
+        columns = list(columns or self.columns)
+        positions = [self.columns.index(column) for column in columns]
+        comoment = self.comoment[np.ix_(positions, positions)]
+        scale = np.sqrt(np.diag(comoment))
+        return pd.DataFrame(comoment / np.outer(scale, scale), index=columns, columns=columns)
+
+    def regression(self, x, y):
+        """
+        x → y 단순 선형회귀(최소제곱)의 기울기, 절편, R²를 반환합니다.
+
+        Returns:
+            pd.Series: '계수', '절편', 'R²'
+        """
+        i, j = self.columns.index(x), self.columns.index(y)
+        slope = self.comoment[i, j] / self.comoment[i, i]
+        intercept = self.mean[j] - slope * self.mean[i]
+        r_squared = self.comoment[i, j] ** 2 / (self.comoment[i, i] * self.comoment[j, j])
+        return pd.Series({'계수': slope, '절편': intercept, 'R²': r_squared})
+
+
+def default_columns(subjects=DEFAULT_SUBJECTS, attendance=True):
+    """기본 누적 컬럼(출석률(%), 과목, 총점)과 분위수 스케치 범위를 반환합니다."""
+    subjects = list(subjects)
+    low, high = SCORE_RANGE
+    ranges = {subject: SCORE_RANGE for subject in subjects}
+    ranges['총점'] = (low * len(subjects), high * len(subjects))
+    columns = subjects + ['총점']
+    if attendance:
+        ranges['출석률(%)'] = ATTENDANCE_RANGE
+        columns = ['출석률(%)'] + columns
+    return columns, ranges
+
+
+@memoized('streaming_stats')
+def stats_from_frame(df, subjects=None, attendance=True, chunksize=LOAD_CHUNKSIZE):
+    """
+    메모리에 있는 DataFrame 하나로 누적기를 만듭니다. subjects를 지정하지 않으면 detect_subjects 결과를 사용합니다.
+
+    attendance가 False이거나 출석률(%) 컬럼이 없으면 과목/총점만 누적하므로,
+    출석률이 비어 있는 행도 과목 통계에 포함됩니다. 실수형 사본이 명단 전체 크기로
+    커지지 않도록 chunksize 행씩 나눠 누적합니다.
+    """
+    subjects = detect_subjects(df) if subjects is None else list(subjects)
+    columns, ranges = default_columns(subjects, attendance and '출석률(%)' in df.columns)
+    stats = StreamingStats(columns, ranges, total_of=subjects)
+    for start in range(0, len(df), chunksize):
+        stats.update(df.iloc[start:start + chunksize])
+    return stats
+
+
+def stream_stats(file_path, subjects=None, chunksize=LOAD_CHUNKSIZE):
+    """
+    CSV 파일을 덩어리 단위로 읽으면서 누적기를 만듭니다. 전체 명단을 메모리에 올리지 않습니다.
+    subjects를 지정하지 않으면 첫 덩어리에서 detect_subjects로 찾은 과목을 사용합니다.
+    """
+    stats = None
+    for chunk in iter_data_chunks(file_path, chunksize):
+        if stats is None:
+            subjects = detect_subjects(chunk) if subjects is None else list(subjects)
+            columns, ranges = default_columns(subjects)
+            stats = StreamingStats(columns, ranges, total_of=subjects)
+        stats.update(chunk)
+    if stats is None:
+        subjects = DEFAULT_SUBJECTS if subjects is None else list(subjects)
+        stats = StreamingStats(*default_columns(subjects), total_of=subjects)  # 빈 파일
+    return stats
+
+
+if __name__ == '__main__':
+    import sys
+
+    stats = stream_stats(sys.argv[1] if len(sys.argv) > 1 else 'student_scores.csv')
+    print(stats.describe().round(1))
+    print(stats.correlation().round(3))
+    print(stats.regression('출석률(%)', '총점').round(3))
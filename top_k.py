@@ -0,0 +1,66 @@
+# 전체 정렬 없이 상위/하위 k명을 선택하는 함수 정의
+import numpy as np
+
+
+def _select_positions(values, k, largest, keep):
+    """
+    values에서 상위(또는 하위) k개의 위치를 np.argpartition으로 선택합니다. (O(N))
+
+    keep='all'이면 rank(method='min') 기준 석차가 k 이내인 행(경계 동점자 포함)을,
+    keep='first'이면 동점자 중 먼저 나온 행부터 정확히 k개를 선택합니다.
+    반환되는 위치는 점수 순으로 정렬되며, 동점이면 원래 순서를 유지합니다.
+    """
+    keys = -values if largest else values
+    positions = np.flatnonzero(~np.isnan(keys))  # 결측 점수는 석차가 없으므로 제외
+    keys = keys[positions]
+    if k <= 0 or len(keys) == 0:
+        return positions[:0]
+    if k < len(keys):
+        threshold = keys[np.argpartition(keys, k - 1)[k - 1]]
+        if keep == 'all':
+            selected = keys <= threshold
+        else:
+            selected = keys < threshold
+            need = k - np.count_nonzero(selected)
+            selected[np.flatnonzero(keys == threshold)[:need]] = True
+        positions = positions[selected]
+        keys = keys[selected]
+    return positions[np.argsort(keys, kind='stable')]
+
+
+def top_k(df, column, k=10, by=None, largest=True, keep='all'):
+    """
+    column 기준 상위 k명을 반환합니다. 전체를 정렬하지 않고 부분 선택만 수행합니다.
+
+    Args:
+        df (pd.DataFrame): 학생 성적 데이터가 담긴 DataFrame.
+        column (str): 기준 점수 컬럼명 (예: '총점', '수학').
+        k (int): 선택할 인원 수.
+        by (str | list, optional): 그룹 기준 컬럼 (예: '학년', ['학년', '반'], '성별').
+                                   지정하면 그룹마다 상위 k명을 선택합니다.
+        largest (bool): True이면 상위, False이면 하위 k명을 선택합니다.
+        keep (str): 'all'이면 rank(method='min') 석차가 k 이내인 동점자를 모두 포함하고,
+                    'first'이면 동점자 중 원래 순서가 앞선 행부터 정확히 k명만 선택합니다.
+
+    Returns:
+        pd.DataFrame: 선택된 행. (그룹 순서 →) 점수 순으로 정렬되며, 동점이면 원래 순서를 유지합니다.
+    """
+    if keep not in ('all', 'first'):
+        raise ValueError("keep은 'all' 또는 'first'만 사용할 수 있습니다.")
+    values = df[column].to_numpy(dtype=np.float64)
+    if by is None:
+        return df.iloc[_select_positions(values, k, largest, keep)]
+
+    groups = df.groupby(by, sort=True, observed=True).indices
+    selected = []
+    for key in sorted(groups):
+        group_positions = groups[key]
+        selected.append(group_positions[_select_positions(values[group_positions], k, largest, keep)])
+    if not selected:
+        return df.iloc[:0]
+    return df.iloc[np.concatenate(selected)]
+
+
+def bottom_k(df, column, k=10, by=None, keep='all'):
+    """column 기준 하위 k명을 반환합니다. (top_k(largest=False)와 같습니다.)"""
+    return top_k(df, column, k, by=by, largest=False, keep=keep)